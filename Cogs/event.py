@@ -1,25 +1,154 @@
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
 from discord import app_commands
-import random, globals
+import random, asyncio, time, io, globals, storage
+from collections import OrderedDict
+from scheduler import QuestionScheduler, EventConfig
+from leaderboard import Leaderboard
+from deck import QuestionDeck
+from questions import QuestionBank
+import export
+from names import NameResolver
+from answers import Answer, AnswerStore
+from similarity import SimilarityIndex
+import metrics
+import profiling
 
 OWNER_ID = 412292524556943363 ## OWNER ID
 CATEGORY_ID = 1423196729393811466  # 🔹 Replace with your #category id
+EVENT_CATEGORIES = globals.Config.EVENT_CATEGORIES or [CATEGORY_ID]  # One event runs per category
 SPAWN_INTERVAL = 20
 TOTAL_QUESTIONS = 100
+STORAGE_BACKEND = globals.Config.STORAGE_BACKEND  # "sqlite", "memory", or "shared-sqlite" when sharded over several processes
+DATABASE_FILE = globals.Config.DATABASE_FILE
+ANSWER_DEADLINE = 3600  # Seconds a question post accepts answers; None keeps it open until the cap
+ANSWER_CAP = None  # Answers after which a question post closes; None for no limit
+SIMILARITY_THRESHOLD = 0.8  # Estimated share of shared text at which answers are flagged as near-identical
+CHANNEL_SELECTION = "random"  # "random", "round_robin" or "weighted" (favours channels used least)
 
 user_scores = {}
-user_answers = {}
-validation_status = {}  # Track validation status: {user_id: {answer_index: "correct"/"wrong"/None}}
+answer_store = AnswerStore()  # Every answer by stable ID, with its validation status
+
+# Every change to the state above is written through to this backend
+db = storage.create_storage(STORAGE_BACKEND, DATABASE_FILE)
+
+
+leaderboard = Leaderboard()  # user_scores in rank order
+LEADERBOARD_PAGE_SIZE = 10
+name_resolver = NameResolver()  # Display names for embeds, works with a trimmed member cache
+similarity_index = SimilarityIndex(threshold=SIMILARITY_THRESHOLD)  # Flags copied answers per question
+
+
+def add_points(user_id: int, points: int) -> int:
+    """Add points to a user's score, keeping the leaderboard and storage in sync. Returns the new total."""
+    user_scores[user_id] = user_scores.get(user_id, 0) + points
+    leaderboard.update(user_id, user_scores[user_id])
+    db.add_score(user_id, points)
+    return user_scores[user_id]
+
+
+def apply_remote_change(kind: str, data: dict):
+    """Apply a change made by another shard process to the in-memory state (storage already has it)"""
+    if kind == "answer":
+        answer_store.add(Answer(data["answer_id"], data["user_id"], data["question_id"], data["answer"]), data["question"])
+        similarity_index.add(data["question_id"], data["answer_id"], data["answer"])
+    elif kind == "validation":
+        if data["answer_id"] in answer_store.records:
+            answer_store.set_status(data["answer_id"], data["status"])
+    elif kind == "score":
+        user_id = data["user_id"]
+        user_scores[user_id] = user_scores.get(user_id, 0) + data["delta"]
+        leaderboard.update(user_id, user_scores[user_id])
+
+
+class OpenPosts:
+    """
+    Question posts still accepting answers, by message ID.
+
+    A post is edited exactly once, when it closes on its deadline or answer cap;
+    individual submissions never touch the shared message.
+    """
+
+    def __init__(self):
+        self.posts = {}  # {message_id: {"channel_id", "question_id", "closes_at", "answers"}}
+        self.timers = {}  # {message_id: deadline or answer cap close task}
+
+    def is_open(self, message_id: int) -> bool:
+        post = self.posts.get(message_id)
+        return post is not None and (post["closes_at"] is None or post["closes_at"] > time.time())
+
+    def open(self, client: discord.Client, message: discord.Message, question_id: int):
+        post = {
+            "channel_id": message.channel.id,
+            "question_id": question_id,
+            "closes_at": time.time() + ANSWER_DEADLINE if ANSWER_DEADLINE else None,
+            "answers": 0
+        }
+        self.posts[message.id] = post
+        db.save_post(message.id, post)
+        self.schedule(client, message.id)
+
+    def restore(self, client: discord.Client, posts: dict):
+        self.posts.update(posts)
+        for message_id in posts:
+            self.schedule(client, message_id)
+
+    def schedule(self, client: discord.Client, message_id: int):
+        closes_at = self.posts[message_id]["closes_at"]
+        if closes_at is not None:
+            self.timers[message_id] = asyncio.create_task(self._close_at(client, message_id, closes_at))
+
+    async def _close_at(self, client: discord.Client, message_id: int, closes_at: float):
+        await asyncio.sleep(max(0, closes_at - time.time()))
+        self.timers.pop(message_id, None)
+        await self.close(client, message_id)
+
+    def count_answer(self, client: discord.Client, message_id: int):
+        post = self.posts.get(message_id)
+        if post is None:
+            return
+        post["answers"] += 1
+        db.save_post(message_id, post)
+        if ANSWER_CAP and post["answers"] >= ANSWER_CAP:
+            # Replaces the deadline timer; kept in timers so the task isn't garbage collected
+            # before it finishes and cancel_timers() can still cancel it
+            timer = self.timers.pop(message_id, None)
+            if timer:
+                timer.cancel()
+            self.timers[message_id] = asyncio.create_task(self._close_at(client, message_id, 0))
+
+    async def close(self, client: discord.Client, message_id: int):
+        post = self.posts.pop(message_id, None)
+        if post is None:
+            return
+        timer = self.timers.pop(message_id, None)
+        if timer:
+            timer.cancel()
+        db.save_post(message_id, None)
+
+        try:
+            message = client.get_partial_messageable(post["channel_id"]).get_partial_message(message_id)
+            await message.edit(view=persistent_view(AnswerButton(post["question_id"], disabled=True)))
+            globals.log_message(message=f"Closed question ID {post['question_id']} after {post['answers']} answers")
+        except discord.HTTPException as e:
+            globals.log_message(error=e)
+
+    def cancel_timers(self):
+        for timer in self.timers.values():
+            timer.cancel()
+        self.timers.clear()
+
+
+open_posts = OpenPosts()
 
 def get_random_spawn_time():
     return random.randint(1800, 3600) # 30 Minutes - 1 Hour
 
-async def fetch_channels_from_category(bot):
+async def fetch_channels_from_category(bot, category_id=CATEGORY_ID):
     try:
-        category = bot.get_channel(CATEGORY_ID)
+        category = bot.get_channel(category_id)
         if category is None or not isinstance(category, discord.CategoryChannel):
-            globals.log_message(error=f"Category with ID {CATEGORY_ID} not found or is not a category")
+            globals.log_message(error=f"Category with ID {category_id} not found or is not a category")
             return []
         
         # Get all text channels in the category
@@ -31,11 +160,51 @@ async def fetch_channels_from_category(bot):
         globals.log_message(error=e)
         return []
 
+
+class ChannelCache:
+    """
+    Text channels per category, resolved once and then kept current by the
+    channel create/delete/update listeners instead of being rebuilt every spawn.
+    """
+
+    def __init__(self):
+        self.channels = {}  # {category_id: [TextChannel, ...]}
+        self.cursor = {}  # {category_id: next round robin position}
+        self.uses = {}  # {channel_id: questions sent there}
+
+    def invalidate(self, category_id):
+        self.channels.pop(category_id, None)
+
+    async def get(self, bot, category_id=CATEGORY_ID) -> list:
+        channels = self.channels.get(category_id)
+        if channels is None:
+            channels = await fetch_channels_from_category(bot, category_id)
+            if channels:
+                self.channels[category_id] = channels
+        return channels
+
+    def pick(self, category_id, channels: list, mode: str = CHANNEL_SELECTION):
+        if mode == "round_robin":
+            position = self.cursor.get(category_id, 0) % len(channels)
+            self.cursor[category_id] = position + 1
+            channel = channels[position]
+        elif mode == "weighted":
+            weights = [1 / (1 + self.uses.get(c.id, 0)) for c in channels]
+            channel = random.choices(channels, weights=weights)[0]
+        else:
+            channel = random.choice(channels)
+        self.uses[channel.id] = self.uses.get(channel.id, 0) + 1
+        return channel
+
+
+channel_cache = ChannelCache()
+
 class QuestionModal(discord.ui.Modal, title="Question Response"):
-    def __init__(self, question: dict):
+    def __init__(self, question: dict, message_id: int):
         super().__init__(timeout=None)
         self.question_text = question["question"]
         self.id = question["id"]
+        self.message_id = message_id  # The question post this answer belongs to
 
         self.answer = discord.ui.TextInput(
             label="Your Answer",
@@ -46,330 +215,675 @@ class QuestionModal(discord.ui.Modal, title="Question Response"):
         )
         self.add_item(self.answer)
 
+    @metrics.timed("ui")
     async def on_submit(self, interaction: discord.Interaction):
         try:
+            # Checked again here since the modal may have been open while the post closed
+            if not open_posts.is_open(self.message_id):
+                await interaction.response.send_message("❌ This question is no longer accepting answers.", ephemeral=True)
+                return
+            if answer_store.has_submitted(interaction.user.id, self.id):
+                await interaction.response.send_message("❌ You have already answered this question!", ephemeral=True)
+                return
+
+            # Claim the question before awaiting anything, so a double submit can't slip past the check above
+            answer_store.submitted.add((interaction.user.id, self.id))
+            try:
+                answer_id = await db.next_answer_id(answer_store.last_id)
+            except Exception:
+                answer_store.submitted.discard((interaction.user.id, self.id))
+                raise
+
+            # Initialize user data if not exists
+            if interaction.user.id not in user_scores:
+                add_points(interaction.user.id, 0)
+
+            # Starts out not validated
+            answer = answer_store.add(Answer(answer_id, interaction.user.id, self.id, self.answer.value), self.question_text)
+            db.save_answer(answer, self.question_text)
+            similarity_index.add(self.id, answer_id, answer.text)
+            open_posts.count_answer(interaction.client, self.message_id)
+
             await interaction.response.send_message(
                 f"✅ Thanks for your response, {interaction.user.mention}!", 
                 ephemeral=True
             )
-
-            # Initialize user data if not exists
-            if interaction.user.id not in user_answers:
-                user_answers[interaction.user.id] = []
-            if interaction.user.id not in user_scores:
-                user_scores[interaction.user.id] = 0
-            if interaction.user.id not in validation_status:
-                validation_status[interaction.user.id] = {}
-
-            user_answers[interaction.user.id].append({
-                "id": self.id,
-                "question": self.question_text,
-                "answer": self.answer.value
-            })
-            
-            # Mark as not validated
-            answer_index = len(user_answers[interaction.user.id])
-            validation_status[interaction.user.id][answer_index] = None
-
-            view = discord.ui.View.from_message(interaction.message)
-            for item in view.children:
-                item.disabled = True
-            await interaction.message.edit(view=view)
         
             globals.log_message(message=f"{interaction.user} answered question ID {self.id}: {self.answer.value}")
         except Exception as e:
             globals.log_message(error=e)
 
 
-class ValidationView(discord.ui.View):
-    def __init__(self, user_id: int, answer_index: int):
-        super().__init__(timeout=180)
-        self.user_id = user_id
-        self.answer_index = answer_index
-        self.validated = False
+def persistent_view(*items) -> discord.ui.View:
+    """
+    A view carrying only dynamic items. It is marked finished before sending, so
+    the library keeps no per-message state; clicks are routed by custom_id instead.
+    """
+    view = discord.ui.View(timeout=None)
+    for item in items:
+        view.add_item(item)
+    view.stop()
+    return view
 
-    @discord.ui.button(label="✅ Correct", style=discord.ButtonStyle.success, row=0)
-    async def correct_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if self.validated:
-            await interaction.response.send_message("❌ This answer has already been validated!", ephemeral=True)
-            return
 
-        # Show point selection view
-        point_view = PointSelectionView(self.user_id, self.answer_index, self)
-        await interaction.response.send_message(
-            "**Select points to award (2-5):**",
-            view=point_view,
-            ephemeral=True
+def record_validation(answer: Answer, status: str, points: int) -> int:
+    """Store a verdict for an answer and award its points. Returns the user's new total."""
+    answer_store.set_status(answer.answer_id, status)
+    db.save_validation(answer.answer_id, status)
+    return add_points(answer.user_id, points)
+
+
+def rubric_summary(score) -> str:
+    """The suggested grade and the rubric terms an answer does and doesn't mention"""
+    verdict = f"✅ Correct, {score.points} points" if score.status == "correct" else "❌ Wrong, 1 point"
+    lines = [f"**Suggested:** {verdict} ({score.hits}/{score.total} terms)"]
+    if score.matched:
+        lines.append("**Mentions:** " + ", ".join(f"`{phrase}`" for phrase in score.matched))
+    if score.missing:
+        lines.append("**Missing:** " + ", ".join(f"`{phrase}`" for phrase in score.missing))
+    return "\n".join(lines)[:1024]
+
+
+def is_validated(answer_id: int) -> bool:
+    return answer_store.is_validated(answer_id)
+
+
+def validation_view(answer_id: int, disabled: bool = False) -> discord.ui.View:
+    return persistent_view(
+        ValidationButton("correct", answer_id, disabled),
+        ValidationButton("wrong", answer_id, disabled)
+    )
+
+
+def point_selection_view(answer_id: int) -> discord.ui.View:
+    return persistent_view(
+        *(PointsButton(points, answer_id) for points in range(2, 6)),
+        ValidationButton("cancel", answer_id)
+    )
+
+
+async def answer_missing(interaction: discord.Interaction, answer_id: int) -> bool:
+    if answer_id in answer_store.records:
+        return False
+    await interaction.response.send_message("❌ That answer no longer exists.", ephemeral=True)
+    return True
+
+
+async def owner_only(interaction: discord.Interaction) -> bool:
+    if interaction.user.id != OWNER_ID:
+        await interaction.response.send_message("❌ You are not authorized to use this command!", ephemeral=True)
+        return False
+    return True
+
+
+class ValidationButton(
+    discord.ui.DynamicItem[discord.ui.Button],
+    template=r"noctowl:validate:(?P<verdict>correct|wrong|cancel):(?P<answer_id>[0-9]+)"
+):
+    styles = {
+        "correct": ("✅ Correct", discord.ButtonStyle.success),
+        "wrong": ("❌ Wrong", discord.ButtonStyle.danger),
+        "cancel": ("↩️ Back", discord.ButtonStyle.gray),
+    }
+
+    def __init__(self, verdict: str, answer_id: int, disabled: bool = False):
+        label, style = self.styles[verdict]
+        super().__init__(
+            discord.ui.Button(
+                label=label,
+                style=style,
+                row=0 if verdict != "cancel" else 1,
+                disabled=disabled,
+                custom_id=f"noctowl:validate:{verdict}:{answer_id}"
+            )
         )
+        self.verdict = verdict
+        self.answer_id = answer_id
 
-    @discord.ui.button(label="❌ Wrong", style=discord.ButtonStyle.danger, row=0)
-    async def wrong_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if self.validated:
-            await interaction.response.send_message("❌ This answer has already been validated!", ephemeral=True)
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(match["verdict"], int(match["answer_id"]))
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        return await owner_only(interaction)
+
+    @metrics.timed("ui")
+    async def callback(self, interaction: discord.Interaction):
+        if await answer_missing(interaction, self.answer_id):
             return
+        if is_validated(self.answer_id):
+            await interaction.response.edit_message(view=validation_view(self.answer_id, disabled=True))
+            return
+
+        if self.verdict == "correct":
+            # Swap in the point buttons on the same message
+            await interaction.response.edit_message(view=point_selection_view(self.answer_id))
+        elif self.verdict == "cancel":
+            await interaction.response.edit_message(view=validation_view(self.answer_id))
+        else:
+            await self.wrong_button(interaction)
 
+    async def wrong_button(self, interaction: discord.Interaction):
+        answer = answer_store.get(self.answer_id)
         # Give 1 point for wrong answers
-        user_scores[self.user_id] = user_scores.get(self.user_id, 0) + 1
-        self.validated = True
+        total = record_validation(answer, "wrong", 1)
         
-        # Update validation status
-        if self.user_id not in validation_status:
-            validation_status[self.user_id] = {}
-        validation_status[self.user_id][self.answer_index] = "wrong"
+        # A cached name or a mention (which renders the name) avoids a lookup before responding
+        username = name_resolver.get(answer.user_id) or f"<@{answer.user_id}>"
         
-        user = interaction.guild.get_member(self.user_id)
-        username = user.display_name if user else f"User {self.user_id}"
-        
-        await interaction.response.send_message(
-            f"❌ Answer marked as **wrong**. {username} receives **1 point** for attempting. Total: **{user_scores[self.user_id]}** points.",
-            ephemeral=False
+        # The verdict and the disabled buttons go out in the single interaction response
+        await interaction.response.edit_message(
+            content=f"❌ Answer marked as **wrong**. {username} receives **1 point** for attempting. Total: **{total}** points.",
+            view=validation_view(self.answer_id, disabled=True),
+            allowed_mentions=discord.AllowedMentions.none()
         )
         
-        # Disable buttons after validation
-        for item in self.children:
-            item.disabled = True
-        await interaction.message.edit(view=self)
-        
-        globals.log_message(message=f"{interaction.user} marked answer {self.answer_index} as wrong for user {self.user_id} - 1 point awarded")
+        globals.log_message(message=f"{interaction.user} marked answer {self.answer_id} as wrong for user {answer.user_id} - 1 point awarded")
 
 
-class PointSelectionView(discord.ui.View):
-    def __init__(self, user_id: int, answer_index: int, parent_view: ValidationView):
-        super().__init__(timeout=60)
-        self.user_id = user_id
-        self.answer_index = answer_index
-        self.parent_view = parent_view
-
-    @discord.ui.button(label="2 Points", style=discord.ButtonStyle.primary)
-    async def two_points(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await self.award_points(interaction, 2)
+class PointsButton(
+    discord.ui.DynamicItem[discord.ui.Button],
+    template=r"noctowl:points:(?P<points>[2-5]):(?P<answer_id>[0-9]+)"
+):
+    def __init__(self, points: int, answer_id: int):
+        super().__init__(
+            discord.ui.Button(
+                label=f"{points} Points",
+                style=discord.ButtonStyle.primary,
+                row=0,
+                custom_id=f"noctowl:points:{points}:{answer_id}"
+            )
+        )
+        self.points = points
+        self.answer_id = answer_id
 
-    @discord.ui.button(label="3 Points", style=discord.ButtonStyle.primary)
-    async def three_points(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await self.award_points(interaction, 3)
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(int(match["points"]), int(match["answer_id"]))
 
-    @discord.ui.button(label="4 Points", style=discord.ButtonStyle.primary)
-    async def four_points(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await self.award_points(interaction, 4)
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        return await owner_only(interaction)
 
-    @discord.ui.button(label="5 Points", style=discord.ButtonStyle.primary)
-    async def five_points(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await self.award_points(interaction, 5)
+    @metrics.timed("ui")
+    async def callback(self, interaction: discord.Interaction):
+        if await answer_missing(interaction, self.answer_id):
+            return
+        if is_validated(self.answer_id):
+            await interaction.response.edit_message(view=validation_view(self.answer_id, disabled=True))
+            return
+        await self.award_points(interaction, self.points)
 
     async def award_points(self, interaction: discord.Interaction, points: int):
-        user_scores[self.user_id] = user_scores.get(self.user_id, 0) + points
-        self.parent_view.validated = True
-        
-        # Update validation status
-        if self.user_id not in validation_status:
-            validation_status[self.user_id] = {}
-        validation_status[self.user_id][self.answer_index] = "correct"
+        answer = answer_store.get(self.answer_id)
+        total = record_validation(answer, "correct", points)
         
-        user = interaction.guild.get_member(self.user_id)
-        username = user.display_name if user else f"User {self.user_id}"
+        username = name_resolver.get(answer.user_id) or f"<@{answer.user_id}>"
         
-        # Send public message in the channel where validation started
-        channel = interaction.channel
-        await channel.send(
-            f"✅ Answer marked as **correct**! {username} receives **{points} points**. Total: **{user_scores[self.user_id]}** points."
+        # The point buttons live on the validation message itself, so one edit announces
+        # the result and disables the buttons
+        await interaction.response.edit_message(
+            content=f"✅ Answer marked as **correct**! {username} receives **{points} points**. Total: **{total}** points.",
+            view=validation_view(self.answer_id, disabled=True),
+            allowed_mentions=discord.AllowedMentions.none()
         )
         
-        # Respond to the ephemeral interaction
-        await interaction.response.send_message(
-            f"✅ Successfully awarded **{points} points** to {username}!",
-            ephemeral=True
+        globals.log_message(message=f"{interaction.user} marked answer {self.answer_id} as correct for user {answer.user_id} - {points} points awarded")
+
+
+class JumpToPageModal(discord.ui.Modal, title="Jump to Page"):
+    def __init__(self, view: "PaginationView"):
+        super().__init__(timeout=60)
+        self.pagination = view
+        self.page = discord.ui.TextInput(
+            label=f"Page number (1-{view.max_pages})",
+            placeholder=str(view.current_page + 1),
+            required=True,
+            max_length=10
         )
-        
-        # Disable buttons in parent view
-        for item in self.parent_view.children:
-            item.disabled = True
-        await interaction.message.edit(view=None)  # Remove point selection buttons
-        
-        # Try to edit the original validation message
+        self.add_item(self.page)
+
+    @metrics.timed("ui")
+    async def on_submit(self, interaction: discord.Interaction):
         try:
-            original_message = await channel.fetch_message(interaction.message.reference.message_id if interaction.message.reference else interaction.message.id)
-            await original_message.edit(view=self.parent_view)
-        except:
-            pass
-        
-        globals.log_message(message=f"{interaction.user} marked answer {self.answer_index} as correct for user {self.user_id} - {points} points awarded")
+            page = int(self.page.value) - 1
+        except ValueError:
+            await interaction.response.send_message("❌ Please enter a valid page number.", ephemeral=True)
+            return
+        await self.pagination.show_page(interaction, page)
 
 
 class PaginationView(discord.ui.View):
-    def __init__(self, pages, timeout=180):
+    """
+    Pages through embeds, either a ready list or a page count plus an async render(page_number)
+    callback. Rendered pages are built on demand and only the most recent few are kept.
+    If slow(page_number) says rendering a page needs API calls, the interaction is
+    deferred first so the render can't run past Discord's 3 second response window.
+    """
+
+    def __init__(self, pages=None, timeout=180, *, page_count=None, render=None, slow=None, cache_size=5):
         super().__init__(timeout=timeout)
-        self.pages = pages
+        if pages is not None:
+            page_count = len(pages)
+
+            async def render(page):
+                return pages[page]
+        self.render = render
+        self.slow = slow
+        self.cache = OrderedDict()  # {page_number: Embed}, least recently viewed first
+        self.cache_size = cache_size
         self.current_page = 0
-        self.max_pages = len(pages)
-        
-        # Disable buttons if only one page
-        if self.max_pages <= 1:
-            self.previous_button.disabled = True
-            self.next_button.disabled = True
+        self.max_pages = page_count
+        self.update_buttons()
+
+    async def get_page(self, page: int) -> discord.Embed:
+        embed = self.cache.get(page)
+        if embed is None:
+            embed = await self.render(page)
+            self.cache[page] = embed
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        else:
+            self.cache.move_to_end(page)
+        return embed
+
+    def is_slow(self, page: int) -> bool:
+        return self.slow is not None and page not in self.cache and self.slow(page)
+
+    async def send(self, interaction: discord.Interaction, ephemeral: bool = False):
+        """Send the first page as the interaction's response"""
+        if self.is_slow(0):
+            await interaction.response.defer(ephemeral=ephemeral, thinking=True)
+            await interaction.followup.send(embed=await self.get_page(0), view=self, ephemeral=ephemeral)
+        else:
+            await interaction.response.send_message(embed=await self.get_page(0), view=self, ephemeral=ephemeral)
+
+    def update_buttons(self):
+        at_start = self.current_page == 0
+        at_end = self.current_page >= self.max_pages - 1
+        self.first_button.disabled = at_start
+        self.previous_button.disabled = at_start
+        self.next_button.disabled = at_end
+        self.last_button.disabled = at_end
+        self.jump_button.disabled = self.max_pages <= 1
+        self.jump_button.label = f"{self.current_page + 1}/{self.max_pages}"
+
+    async def show_page(self, interaction: discord.Interaction, page: int):
+        self.current_page = max(0, min(page, self.max_pages - 1))
+        self.update_buttons()
+        if self.is_slow(self.current_page):
+            await interaction.response.defer()
+            await interaction.edit_original_response(embed=await self.get_page(self.current_page), view=self)
         else:
-            self.previous_button.disabled = True  # Disable on first page
+            await interaction.response.edit_message(embed=await self.get_page(self.current_page), view=self)
+
+    @discord.ui.button(label="⏮️", style=discord.ButtonStyle.gray)
+    @metrics.timed("ui")
+    async def first_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.show_page(interaction, 0)
 
     @discord.ui.button(label="◀️ Previous", style=discord.ButtonStyle.gray)
+    @metrics.timed("ui")
     async def previous_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if self.current_page > 0:
-            self.current_page -= 1
-            
-            # Update button states
-            self.previous_button.disabled = (self.current_page == 0)
-            self.next_button.disabled = False
-            
-            await interaction.response.edit_message(embed=self.pages[self.current_page], view=self)
+        await self.show_page(interaction, self.current_page - 1)
+
+    @discord.ui.button(label="1/1", style=discord.ButtonStyle.blurple)
+    @metrics.timed("ui")
+    async def jump_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await interaction.response.send_modal(JumpToPageModal(self))
 
     @discord.ui.button(label="Next ▶️", style=discord.ButtonStyle.gray)
+    @metrics.timed("ui")
     async def next_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if self.current_page < self.max_pages - 1:
-            self.current_page += 1
-            
-            # Update button states
-            self.next_button.disabled = (self.current_page == self.max_pages - 1)
-            self.previous_button.disabled = False
-            
-            await interaction.response.edit_message(embed=self.pages[self.current_page], view=self)
+        await self.show_page(interaction, self.current_page + 1)
+
+    @discord.ui.button(label="⏭️", style=discord.ButtonStyle.gray)
+    @metrics.timed("ui")
+    async def last_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.show_page(interaction, self.max_pages - 1)
+
+
+class ReviewView(discord.ui.View):
+    """
+    Grades a queue of pending answers in one message. Each verdict records the result
+    and swaps in the next answer with a single edit; the next embed is rendered while
+    the reviewer is still reading the current one. For questions with a rubric, the
+    suggested grade can be accepted with one click, for one answer or for every answer
+    that mentions all of the rubric's terms.
+    """
+
+    def __init__(self, cog: "QuestionCog", queue: list, timeout=900):
+        super().__init__(timeout=timeout)
+        self.cog = cog
+        self.queue = queue  # [answer_id, ...]
+        self.position = 0
+        self.reviewed = 0
+        self.rendered = {}  # {position: Embed} for the current and next answer
+        rubrics = cog.questions.rubrics
+        self.has_rubrics = len(rubrics) > 0 and any(answer_store.get(answer_id).question_id in rubrics for answer_id in queue)
+        self.verdict_buttons()
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        return await owner_only(interaction)
+
+    def render(self, position: int) -> discord.Embed:
+        embed = self.rendered.pop(position, None)
+        if embed is None:
+            embed = self.cog.answer_embed(self.queue[position], f"Review {position + 1}/{len(self.queue)} • {self.reviewed} graded")
+        return embed
+
+    def prerender(self):
+        """Build the next answer's embed ahead of the reviewer's decision"""
+        position = self.next_pending(self.position + 1)
+        if position is not None and position not in self.rendered:
+            self.rendered[position] = self.cog.answer_embed(
+                self.queue[position], f"Review {position + 1}/{len(self.queue)} • {self.reviewed + 1} graded"
+            )
+
+    def next_pending(self, start: int):
+        # Answers graded elsewhere since the queue was built are skipped
+        for position in range(start, len(self.queue)):
+            if not is_validated(self.queue[position]):
+                return position
+        return None
+
+    def suggestion(self, position: int):
+        answer = answer_store.get(self.queue[position])
+        return self.cog.questions.score_answer(answer.question_id, answer.text)
+
+    def add_button(self, label: str, style: discord.ButtonStyle, callback, row: int = 0):
+        button = discord.ui.Button(label=label, style=style, row=row)
+        button.callback = metrics.timed("ui", f"ReviewView.{callback.__name__}")(callback)
+        self.add_item(button)
+
+    def verdict_buttons(self):
+        self.clear_items()
+        self.add_button("✅ Correct", discord.ButtonStyle.success, self.correct)
+        self.add_button("❌ Wrong", discord.ButtonStyle.danger, self.wrong)
+        score = self.suggestion(self.position) if self.position < len(self.queue) else None
+        if score is not None:
+            label = f"🎯 Accept {score.points} Points" if score.status == "correct" else "🎯 Accept Wrong"
+            self.add_button(label, discord.ButtonStyle.primary, self.accept)
+        self.add_button("⏭️ Skip", discord.ButtonStyle.gray, self.skip)
+        self.add_button("⏹️ Stop", discord.ButtonStyle.gray, self.finish)
+        if self.has_rubrics:
+            self.add_button("⚡ Accept All Full Matches", discord.ButtonStyle.primary, self.accept_complete, row=1)
+
+    def point_buttons(self):
+        self.clear_items()
+        for points in range(2, 6):
+            async def award(interaction: discord.Interaction, points=points):
+                await self.grade(interaction, "correct", points)
+            self.add_button(f"{points} Points", discord.ButtonStyle.primary, award)
+        self.add_button("↩️ Back", discord.ButtonStyle.gray, self.back, row=1)
+
+    async def edit(self, interaction: discord.Interaction, **kwargs):
+        """Edit the review message, through the original response if the click was already acknowledged"""
+        if interaction.response.is_done():
+            await interaction.edit_original_response(**kwargs)
+        else:
+            await interaction.response.edit_message(**kwargs)
+
+    async def show_current(self, interaction: discord.Interaction, content: str = None):
+        position = self.next_pending(self.position)
+        if position is None:
+            await self.finish(interaction, content)
+            return
+        self.position = position
+        self.verdict_buttons()
+        await self.edit(interaction, content=content, embed=self.render(position), view=self)
+        self.prerender()
+
+    async def grade(self, interaction: discord.Interaction, status: str, points: int):
+        answer = answer_store.get(self.queue[self.position])
+        if answer.status is not None:
+            await self.show_current(interaction, "⚠️ That answer was graded elsewhere; moved on.")
+            return
+
+        total = record_validation(answer, status, points)
+        self.reviewed += 1
+        self.position += 1
+        globals.log_message(message=f"{interaction.user} marked answer {answer.answer_id} as {status} for user {answer.user_id} - {points} points awarded")
+
+        verdict = "✅ correct" if status == "correct" else "❌ wrong"
+        await self.show_current(interaction, f"Last: <@{answer.user_id}> marked **{verdict}** (+{points}, total **{total}**).")
+
+    async def correct(self, interaction: discord.Interaction):
+        self.point_buttons()
+        await interaction.response.edit_message(view=self)
+
+    async def back(self, interaction: discord.Interaction):
+        self.verdict_buttons()
+        await interaction.response.edit_message(view=self)
+
+    async def wrong(self, interaction: discord.Interaction):
+        await self.grade(interaction, "wrong", 1)
+
+    async def accept(self, interaction: discord.Interaction):
+        score = self.suggestion(self.position)
+        await self.grade(interaction, score.status, score.points)
+
+    async def accept_complete(self, interaction: discord.Interaction):
+        """Grade every pending answer left in the queue that mentions all of its rubric's terms"""
+        # A long queue can take longer than the 3 seconds Discord allows for a response, so the
+        # click is acknowledged first (without buttons, so nothing else is graded meanwhile)
+        self.clear_items()
+        await interaction.response.edit_message(content="⚡ Accepting answers that mention every rubric term...", view=self)
+        accepted = 0
+        for position in range(self.position, len(self.queue)):
+            answer = answer_store.get(self.queue[position])
+            if answer.status is not None:
+                continue
+            score = self.cog.questions.score_answer(answer.question_id, answer.text)
+            if score is not None and score.complete:
+                record_validation(answer, "correct", score.points)
+                self.rendered.pop(position, None)
+                accepted += 1
+            if position % 256 == 255:
+                await asyncio.sleep(0)  # Long queues shouldn't hold up other handlers
+        self.reviewed += accepted
+        globals.log_message(message=f"{interaction.user} accepted the rubric grade of {accepted} answers")
+        await self.show_current(interaction, f"⚡ Accepted **{accepted}** answers that mention every rubric term.")
+
+    async def skip(self, interaction: discord.Interaction):
+        self.position += 1
+        await self.show_current(interaction)
+
+    async def finish(self, interaction: discord.Interaction, content: str = None):
+        self.stop()
+        embed = discord.Embed(
+            title="📋 Review Finished",
+            description=f"Graded **{self.reviewed}** answers. **{sum(1 for answer_id in self.queue if not is_validated(answer_id))}** from this queue are still pending.",
+            color=discord.Color.green()
+        )
+        await self.edit(interaction, content=content, embed=embed, view=None)
 
 
 class QuestionCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        self.questions_sent = 0  # Fixed: Made it an instance variable
-        self.asked_questions = []
-        self.questions = {
-            ## ECONOMY
-            1: "A member claims they lost 50k currency due to a bot glitch. They have proof via screenshot. How would you handle this?",
-            2: "Someone wants you to add 1 billion currency to their account because they're a content creator. What's your response?",
-            3: "The server economy is inflated - everyone has billions. What commands would you suggest to them inorder fix this?",
-            4: "A member accidentally bought 100 of an expensive item. They want a refund. What will you do?",
-            5: "Someone's complaining that te leaderboard shows members who left the server 6 months ago. How do you fix this?",
-            6: "A user asks why they can see everyone else's balance but others can't see theirs. What setting controls this?",
-            7: "The server owner want new members to start with 5000 coins in their bank. How do you set this up?",
-            8: "Someone's asking why they only earn 50-100 currency in their server while others earn 500-1000 in a different server. What would you suggest them?",
-            9: "A member wants their economy data completely removed from the server. What command handles this?",
-            10: "A trusted member asks you to give them 10k as a 'loan' they'll pay back. What's the appropriate response?",
-            11: "Someone's complaining they can't deposit money in their bank. What setting do you need to check?",
-            12: "A member sold an item to another member outside the bot, but wants you to transfer the money. Should you?",
-            13: "The owner wants to change the currency from coins to gems. How do you do this?",
-            14: "Someone wants to hide themselves from the leaderboard for privacy. Is this possible and how?",
-            15: "If a user request you to give them free eldorium or blazecoins, what's your response?",
-            
-            ## ITEM MANAGEMENT
-            16: "A member bought a VIP Role item but didn't receive the role. What do you check first?",
-            17: "The shop has an item priced at 100 currency that should be 100k. How do you fix this?",
-            18: "Someone wants to create an item that removes a role instead of giving one. Is this possible?",
-            19: "An item's description has a typo. What's the command to fix just the description?",
-            20: "The owner wants an item to have unlimited stock instead of the current limit of 50. How do you change this?",
-            21: "A limited edition item should only be buyable by people with the Premium role. How do you set this up?",
-            22: "Someone accidentally bought an item meant for another member. Can you transfer it between their inventories?",
-            23: "An item's emoji is displaying incorrectly. How would you remove it or change it?",
-            24: "The owner wants to see all custom items in the server before deciding which to remove. What command shows this?",
-            25: "A member wants you to create an item that costs 0 currency. Is this allowed and how would you explain it?",
-            
-            ## COMMAND CONFIGURATION
-            26: "Members are complaining that rob cooldown is too short - people get robbed every hour. How do you increase it?",
-            27: "Someone's asking why they can't use the slots command in #general but can use it in #casino. What controls this?",
-            28: "The owner wants to disable all gambling commands server-wide. What's the fastest way?",
-            29: "Work command pays too little - members want it increased to 1000-5000 per use. How do you set this?",
-            30: "Someone says blackjack has no maximum bet and people are betting billions. How do you add a limit?",
-            31: "The rob success rate is 60% and the owner wants it lowered to 30%. What command do you use?",
-            32: "Members can use bot commands in every channel and it's getting spammy. How do you restrict it to specific channels?",
-            33: "The owner wants grab-jobs to appear more frequently. What setting controls this?",
-            34: "Someone's asking why the minimum bet for dice is 10 currency. They want it raised to 100. How do you change this?",
-            35: "Work command cooldown is 24 hours and members say it's too long. Owner agrees to reduce it to 12 hours. How?",
-            36: "The owner wants member nicknames to show on leaderboards instead of usernames. What command changes this?",
-            37: "Chat money system should give 10-50 currency every 5 messages. How would you enable and configure this?",
-            
-            ## PERMISSION & AUTHORITY
-            38: "A moderator is asking why they can't use add-money command even though they have Manage Server permission. What's missing?",
-            39: "The owner wants specific trusted members to use admin economy commands without giving them Administrator. How?",
-            40: "Someone with Authority role accidentally reset the entire server economy. How could this have been prevented?",
-            41: "A staff member wants to know what permissions they need to create giveaways. What do you tell them?",
-            42: "You need to remove someone from the Authority list because they're abusing commands. How?",
-            43: "The owner is asking what's the difference between Authority and Administrator permission for bot commands. How do you explain?",
-            44: "A staff member can use toggle-module but not set-prefix. Why might this be?",
-            45: "Someone's asking if they need special permissions to view the server's current tax settings. What's the answer?",
-            
-            ## ADVANCED FEATURES
-            46: "The owner wants a lottery system where members can buy tickets. How would you set this up?",
-            47: "Members with Gold role should earn 5000 coins automatically every 24 hours. What command enables this?",
-            48: "The owner wants add-money and remove-money actions logged to a specific channel. How do you set this up?",
-            49: "Someone's asking if they can create custom job responses for the grab-job feature. Is this possible?",
-            50: "The owner wants the default grab-jobs disabled but custom ones enabled. How do you configure this?",
-            51: "Bank limit is currently 100k and the owner wants different limits for different roles. Is this possible with these commands?",
-            52: "The owner wants counting channel to restart from 1 if someone messes up. How do you set this up?",
-            53: "Someone's asking how to make work command replies more personalized for the server theme. What command helps?",
-            54: "The owner wants purchase logs enabled but add-money logs disabled. How do you configure this separately?",
-            55: "Members want to know current tax settings before they deposit money. What command shows this information?",
-            
-            ## PROBLEM-SOLVING & POLICY
-            56: "A member is demanding you give them items/money in the eldoria server because other servers do it. How do you respond professionally?",
-            57: "Someone found a way to exploit grab-jobs by creating alt accounts. What immediate action do you take?",
-            58: "Two members are fighting because one robbed the other for 50k. Both are demanding you intervene. What do you do?",
-            59: "The leaderboard shows someone with 999 trillion currency, which seems impossible. What do you investigate?",
-            60: "A member threatens to report the server if you don't give them compensation for lost currency with no proof. How do you handle this?",
-            
-            # GENERAL MODERATION
-            61: "A user is spamming the same message across multiple channels. What's your immediate action, and what follow-up steps would you take?",
-            62: "Two members are having a heated argument in a public channel. The discussion is getting personal but hasn't violated any explicit rules yet. How do you handle this?",
-            63: "A new member joins and immediately starts posting NSFW content in a SFW channel. What's your response?",
-            64: "You notice a member has changed their username to something offensive. What do you do?",
-            65: "Someone reports that another user sent them threatening DMs. The reporter provides screenshots. How do you proceed?",
-            66: "A popular member with a good history violates a minor rule for the first time. How do you balance fairness with their standing in the community?",
-            67: "Multiple users are reporting the same person for 'being annoying' but you can't find any rule violations. What's your approach?",
-            68: "You see a suspicious link being shared. How do you determine if it's malicious and what actions do you take?",
-            
-            69: "What information should you document when issuing a warning or ban?",
-            70: "When should you escalate an issue to senior moderators or admins versus handling it yourself?",
-            71: "A user appeals their ban and claims they were unfairly punished. What's your process for reviewing this?",
-            72: "How do you handle a situation where you personally dislike a user but they haven't broken any rules?",
-            73: "What's the difference between a timeout, a kick, and a ban? When would you use each?",
-            74: "Should moderators explain their actions publicly, in DMs, or both? What are the pros and cons?",
-            75: "How would you handle discovering that another moderator abused their power?",
-            
-            76: "What's the purpose of Discord's AutoMod feature and what are its limitations?",
-            77: "How can you tell if a user is using an alt account to evade a ban?",
-            78: "What Discord permissions should a moderator have, and which ones are unnecessary?",
-            79: "How do slow mode and verification levels help with moderation?",
-            80: "What's the difference between deleting messages and timing someone out?",
-            
-            81: "How do you balance strict rule enforcement with maintaining a welcoming community atmosphere?",
-            82: "A long-time member is consistently bending the rules without technically breaking them. How do you address this?",
-            83: "What would you do if community members start complaining that moderation is too strict or too lenient?",
-            84: "How should moderators interact with the community when not actively moderating?",
-            85: "Someone is asking for mental health advice or expressing suicidal thoughts. What's your response?"
-        }
-        self.question_task.start()
+        self.scheduler = QuestionScheduler(self.spawn_question)
+        self.startup_task = None
+        self.similarity_task = None
+        self.questions = QuestionBank(globals.Config.QUESTION_BANK)  # Read in cog_load
 
-    def cog_unload(self):
-        self.question_task.cancel()
+    async def cog_load(self):
+        # Buttons are routed by custom_id, so posts from before a restart keep working
+        self.bot.add_dynamic_items(AnswerButton, ValidationButton, PointsButton)
 
-    @tasks.loop(seconds=SPAWN_INTERVAL)  # Fixed: Use constant initial value
-    async def question_task(self):
-        await self.bot.wait_until_ready()
+        # A large bank takes a while to parse, so it's read off the event loop before any handler needs it
+        try:
+            await asyncio.to_thread(self.questions.load)
+        except (OSError, ValueError) as e:
+            globals.log_message(error=e)  # Read again on first use, failing the handler that needs it
+
+        # Restore the event state saved before the last restart / reload
+        await db.open()
+        db.listen(apply_remote_change)
+        scores, rows = await db.load()
+        user_scores.update(scores)
+        answer_store.rebuild(rows)
+        leaderboard.rebuild(user_scores)
+        globals.log_message(message=f"Loaded {len(scores)} scores and {len(answer_store)} answers from storage")
+
+        self.startup_task = asyncio.create_task(self.start_events())
+        self.similarity_task = asyncio.create_task(self.load_similarity())
+
+    async def cog_unload(self):
+        self.bot.remove_dynamic_items(AnswerButton, ValidationButton, PointsButton)
+        if self.startup_task:
+            self.startup_task.cancel()
+        if self.similarity_task:
+            self.similarity_task.cancel()
+        self.scheduler.stop()
+        open_posts.cancel_timers()
+        await db.close()
+
+    async def load_similarity(self):
+        """
+        Sign every stored answer on a worker thread, catch up with answers submitted meanwhile,
+        then keep signing new answers in the background
+        """
+        snapshot = [(answer.question_id, answer.answer_id, answer.text) for answer in list(answer_store)]
+        await asyncio.to_thread(similarity_index.load, snapshot)
+        for answer in list(answer_store):
+            similarity_index.add(answer.question_id, answer.answer_id, answer.text)
+        globals.log_message(message=f"Indexed {len(similarity_index)} answers for similarity checks")
+        await similarity_index.run_signer()
+
+    def question_text(self, question_id: int) -> str:
+        """Question text from the bank, or from a stored answer if the question was removed since"""
+        text = self.questions.get(question_id) or answer_store.question_texts.get(question_id)
+        return text or f"Question #{question_id}"
+
+    def answer_embed(self, answer_id: int, position: str) -> discord.Embed:
+        """The grading embed for one answer; position goes in the footer (e.g. 'Answer 2/7')"""
+        answer = answer_store.get(answer_id)
+        user_id = answer.user_id
+        
+        # Check if already validated
+        status = answer.status
+        status_text = ""
+        if status == "correct":
+            status_text = "\n\n**⚠️ This answer has already been marked as CORRECT**"
+        elif status == "wrong":
+            status_text = "\n\n**⚠️ This answer has already been marked as WRONG**"
         
-        # Fetch all channels from the category
-        channels = await fetch_channels_from_category(self.bot)
+        embed = discord.Embed(
+            title="📋 Answer Validation",
+            description=f"**User:** <@{user_id}>\n**Answer ID:** {answer_id}{status_text}",
+            color=discord.Color.gold()
+        )
+        embed.add_field(
+            name=f"Question ID: {answer.question_id}",
+            value=self.question_text(answer.question_id),
+            inline=False
+        )
+        embed.add_field(
+            name="📝 Answer",
+            value=answer.text,
+            inline=False
+        )
+        similar = similarity_index.similar_to(answer_id)
+        if similar:
+            embed.add_field(
+                name="🧬 Similar Answers",
+                value="\n".join(
+                    f"#{other_id} by <@{answer_store.get(other_id).user_id}> ({score:.0%} alike)" for other_id, score in similar
+                ),
+                inline=False
+            )
+        rubric = self.questions.score_answer(answer.question_id, answer.text)
+        if rubric is not None:
+            embed.add_field(name="🔑 Rubric", value=rubric_summary(rubric), inline=False)
+        embed.add_field(
+            name="🎯 Scoring",
+            value="✅ **Correct:** 2-5 points (you choose)\n❌ **Wrong:** 1 point",
+            inline=False
+        )
+        rank = leaderboard.rank(user_id)
+        embed.set_footer(text=f"Current Score: {user_scores.get(user_id, 0)} points{f' (Rank #{rank})' if rank else ''} | {position}")
+        return embed
+
+    def event_question_ids(self, category_id: int) -> list:
+        """Question IDs an event may ask, limited to its configured question categories"""
+        return self.questions.ids(globals.Config.EVENT_QUESTION_CATEGORIES.get(str(category_id)))
+
+    async def load_deck(self, category_id: int, saved: dict) -> QuestionDeck:
+        """Resume the category's saved deck, or shuffle a new one"""
+        deck_id = str(category_id)
+        if deck_id in saved:
+            deck = QuestionDeck.from_dict(saved[deck_id])
+            if deck.reconcile(self.event_question_ids(category_id)):
+                db.save_deck(deck_id, deck.to_dict())
+        else:
+            seed = globals.Config.QUESTION_SEED
+            deck = QuestionDeck.shuffled(self.event_question_ids(category_id), None if seed is None else seed + category_id)
+            db.save_deck(deck_id, deck.to_dict())
+        return deck
+
+    async def start_events(self):
+        await self.bot.wait_until_ready()
+        posts = {int(message_id): post for message_id, post in (await db.load_posts()).items()}
+        if globals.Config.SHARD_IDS is not None:
+            # Posts in guilds on other processes' shards are closed by those processes
+            posts = {message_id: post for message_id, post in posts.items() if self.bot.get_channel(post["channel_id"]) is not None}
+        open_posts.restore(self.bot, posts)
+
+        saved = await db.load_decks()
+        for category_id in EVENT_CATEGORIES:
+            if globals.Config.SHARD_IDS is not None and self.bot.get_channel(category_id) is None:
+                continue  # The category's guild is on a shard run by another process
+            deck = await self.load_deck(category_id, saved)
+            config = EventConfig(category_id, TOTAL_QUESTIONS, deck)
+            if config.sent >= config.total or not deck.remaining:
+                continue  # Finished before the restart
+            # A resumed event waits a normal interval instead of posting right away
+            self.scheduler.add(config, get_random_spawn_time() if deck.cursor else 0)
+        self.scheduler.start()
+        globals.log_message(message=f"Started question events in {len(EVENT_CATEGORIES)} categories")
+
+    async def spawn_question(self, config: EventConfig):
+        """Post the next question for one event; returns the delay until the next one or None when done"""
+        # Cached channels of the category
+        channels = await channel_cache.get(self.bot, config.category_id)
         
         if not channels:
-            globals.log_message(error="No channels found in the category")
-            return
+            globals.log_message(error=f"No channels found in category {config.category_id}")
+            return SPAWN_INTERVAL
         
-        # Randomly select a channel from the category
-        channel = random.choice(channels)
+        # Select a channel from the category
+        channel = channel_cache.pick(config.category_id, channels)
         globals.log_message(message=f"Selected channel: {channel.name} for question")
 
-        available_questions = list(set(self.questions.keys()) - set(self.asked_questions))
+        question_id = config.deck.draw()
 
-        if not available_questions:
+        if question_id is None:
             # All questions have been asked
-            self.question_task.stop()
-            globals.log_message(message="All questions have been asked. Stopping task.")
-            return
+            globals.log_message(message=f"All questions have been asked in category {config.category_id}. Stopping event.")
+            return None
+
+        try:
+            message = await self.post_question(channel, question_id)
+        except Exception:
+            # The question goes back on the deck, and the scheduler retries
+            config.deck.undraw()
+            raise
+        # Saved only once the post exists, so a failed send never uses up a question
+        db.save_deck_cursor(str(config.category_id), config.deck.cursor)
+        open_posts.open(self.bot, message, question_id)
+        
+        config.sent += 1
+        globals.log_message(message=f"Sent question {config.sent}/{config.total} in category {config.category_id}")
+        
+        # Check if we've sent all questions AFTER sending
+        if config.sent >= config.total:
+            globals.log_message(message=f"Reached {config.total} questions in category {config.category_id}. Stopping event.")
+            return None
+        
+        # Delay until the next spawn of this event
+        return get_random_spawn_time()
 
-        question_id = random.choice(available_questions)
-        self.asked_questions.append(question_id)
+    async def post_question(self, channel: discord.TextChannel, question_id: int) -> discord.Message:
         question_text = self.questions[question_id]
         question_data = {
             "id": question_id,
@@ -384,73 +898,306 @@ class QuestionCog(commands.Cog):
         )
         embed.add_field(
             name="📝 Instructions",
-            value="Click the button below to submit your answer. Maximum 500 characters.",
+            value="Click the button below to submit your answer. Maximum 500 characters. One answer per member."
+                  + (f"\nAnswers close <t:{int(time.time()) + ANSWER_DEADLINE}:R>." if ANSWER_DEADLINE else ""),
             inline=False
         )
         embed.set_footer(text=f"Question #{question_id} • Answer thoughtfully!")
         
-        view = discord.ui.View()
-        view.add_item(AnswerButton(question_data))
-        await channel.send(embed=embed, view=view)
-        
-        self.questions_sent += 1  # Fixed: Use self.questions_sent
-        globals.log_message(message=f"Sent question {self.questions_sent}/{TOTAL_QUESTIONS}")
-        
-        # Check if we've sent all questions AFTER sending
-        if self.questions_sent >= TOTAL_QUESTIONS:
-            self.question_task.stop()
-            globals.log_message(message=f"Reached {TOTAL_QUESTIONS} questions. Stopping task.")
-            return
-        
-        # Change interval for next iteration
-        self.question_task.change_interval(seconds=get_random_spawn_time())
+        return await channel.send(embed=embed, view=persistent_view(AnswerButton(question_id)))
 
-    @question_task.before_loop
-    async def before_question_task(self):
-        await self.bot.wait_until_ready()
+    def answer_rows(self):
+        """Every stored answer as a flat row; safe to iterate from a worker thread"""
+        # The values are copied here, on the event loop, so answers graded during the export
+        # can't change rows; only the dicts are built lazily on the worker thread
+        fields = ("answer_id", "user_id", "question_id", "question", "answer", "status")
+        snapshot = [
+            (answer.answer_id, answer.user_id, answer.question_id, self.question_text(answer.question_id),
+             answer.text, answer.status or "pending")
+            for answer in answer_store.records.values()
+        ]
+        return (dict(zip(fields, row)) for row in snapshot)
 
-    @app_commands.command(name="points", description="View the points leaderboard")
-    async def points(self, interaction: discord.Interaction):
+    def score_rows(self):
+        """Every ranked user as a flat row; safe to iterate from a worker thread"""
+        # The ranking is copied once here, on the event loop, so scores changing during the
+        # export can't shift rows between pages
+        ranking = leaderboard.page(0, len(leaderboard))
+        return ({"rank": rank, "user_id": user_id, "score": score} for rank, user_id, score in ranking)
+
+    async def send_export(self, interaction: discord.Interaction, rows, basename: str, fields: list, fmt: str):
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        size_limit = interaction.guild.filesize_limit if interaction.guild else export.DEFAULT_SIZE_LIMIT
+
+        # Compression and disk writes happen on a worker thread
+        directory, paths, count = await asyncio.to_thread(export.write_export, rows, basename, fields, fmt, size_limit)
+        try:
+            # One file per message, since the size limit applies to the whole message
+            for number, path in enumerate(paths, 1):
+                content = f"📦 Exported **{count}** rows" if number == 1 else None
+                if len(paths) > 1:
+                    content = f"{content + ' ' if content else ''}(part {number}/{len(paths)})"
+                await interaction.followup.send(content=content, file=discord.File(path), ephemeral=True)
+        finally:
+            await asyncio.to_thread(export.remove_export, directory)
+        globals.log_message(message=f"{interaction.user} exported {count} rows to {len(paths)} {fmt} file(s)")
+
+    @app_commands.command(name="export-answers", description="Download every submitted answer as a compressed file")
+    @app_commands.describe(file_format="File format (default CSV)")
+    @app_commands.choices(file_format=[
+        app_commands.Choice(name="CSV", value="csv"),
+        app_commands.Choice(name="JSON Lines", value="jsonl")
+    ])
+    @metrics.timed("command")
+    async def export_answers(self, interaction: discord.Interaction, file_format: app_commands.Choice[str] = None):
+        try:
+            if interaction.user.id != OWNER_ID:
+                await interaction.response.send_message("❌ You are not authorized to use this command!", ephemeral=True)
+                return
+
+            fields = ["answer_id", "user_id", "question_id", "question", "answer", "status"]
+            await self.send_export(interaction, self.answer_rows(), "answers", fields, file_format.value if file_format else "csv")
+        except Exception as e:
+            globals.log_message(error=e)
+            await interaction.followup.send("❌ An error occurred while exporting answers.", ephemeral=True)
+
+    @app_commands.command(name="export-scores", description="Download the leaderboard as a compressed file")
+    @app_commands.describe(file_format="File format (default CSV)")
+    @app_commands.choices(file_format=[
+        app_commands.Choice(name="CSV", value="csv"),
+        app_commands.Choice(name="JSON Lines", value="jsonl")
+    ])
+    @metrics.timed("command")
+    async def export_scores(self, interaction: discord.Interaction, file_format: app_commands.Choice[str] = None):
+        try:
+            if interaction.user.id != OWNER_ID:
+                await interaction.response.send_message("❌ You are not authorized to use this command!", ephemeral=True)
+                return
+
+            fields = ["rank", "user_id", "score"]
+            await self.send_export(interaction, self.score_rows(), "scores", fields, file_format.value if file_format else "csv")
+        except Exception as e:
+            globals.log_message(error=e)
+            await interaction.followup.send("❌ An error occurred while exporting scores.", ephemeral=True)
+
+    @app_commands.command(name="reload-questions", description="Reload the question bank from disk")
+    @metrics.timed("command")
+    async def reload_questions(self, interaction: discord.Interaction):
         try:
             if interaction.user.id != OWNER_ID:
                 await interaction.response.send_message("❌ You are not authorized to use this command!", ephemeral=True)
                 return
 
+            # Parse off the event loop; the live bank is only replaced once the new one is valid
+            bank = await asyncio.to_thread(QuestionBank(self.questions.path).load)
+            self.questions = bank
+
+            for config in self.scheduler.configs.values():
+                if config.deck.reconcile(self.event_question_ids(config.category_id)):
+                    db.save_deck(str(config.category_id), config.deck.to_dict())
+
+            await interaction.response.send_message(
+                f"✅ Reloaded **{len(bank)}** questions in **{len(bank.categories())}** categories, **{len(bank.rubrics)}** with a rubric.",
+                ephemeral=True
+            )
+            globals.log_message(message=f"{interaction.user} reloaded the question bank ({len(bank)} questions)")
+        except Exception as e:
+            globals.log_message(error=e)
+            await interaction.response.send_message(f"❌ Failed to reload questions: {e}", ephemeral=True)
+
+    @app_commands.command(name="bot-stats", description="Handler latency, REST usage and event loop lag")
+    @metrics.timed("command")
+    async def stats(self, interaction: discord.Interaction):
+        try:
+            if interaction.user.id != OWNER_ID:
+                await interaction.response.send_message("❌ You are not authorized to use this command!", ephemeral=True)
+                return
+
+            registry = metrics.registry
+            uptime = int(time.time() - registry.started)
             embed = discord.Embed(
-                title="📊 Points Leaderboard",
-                description="Here are the scores of all participants:",
+                title="📈 Bot Stats",
+                description=f"**Uptime:** {uptime // 3600}h {uptime % 3600 // 60}m • **Gateway latency:** {self.bot.latency * 1000:.0f} ms",
                 color=discord.Color.blue()
             )
+
+            errors = {(labels["kind"], labels["handler"]): count for labels, count in registry.series("handler_errors_total")}
+            handlers = sorted(registry.series("handler_seconds"), key=lambda entry: entry[1].count, reverse=True)
+            lines = [
+                f"`{labels['handler']}` {histogram.count}× • p50 {histogram.quantile(0.5) * 1000:.1f} ms • "
+                f"p95 {histogram.quantile(0.95) * 1000:.1f} ms"
+                + (f" • ⚠️ {errors[(labels['kind'], labels['handler'])]:.0f} errors" if (labels["kind"], labels["handler"]) in errors else "")
+                for labels, histogram in handlers[:8]
+            ]
+            embed.add_field(name="⏱️ Handlers", value="\n".join(lines) or "No calls yet", inline=False)
+
+            calls = {}
+            for labels, count in registry.series("rest_requests_total"):
+                route = f"{labels['method']} {labels['route']}"
+                calls[route] = calls.get(route, 0) + count
+            top = sorted(calls.items(), key=lambda entry: entry[1], reverse=True)[:8]
+            embed.add_field(
+                name=f"🌐 REST Calls ({sum(calls.values()):.0f})",
+                value="\n".join(f"`{route}` {count:.0f}" for route, count in top) or "None yet",
+                inline=False
+            )
+
+            lag = registry.series("event_loop_lag_seconds")
+            if lag:
+                histogram = lag[0][1]
+                last = registry.gauges.get(("event_loop_lag_last_seconds", ()), 0)
+                embed.add_field(
+                    name="🔁 Event Loop Lag",
+                    value=f"Last {last * 1000:.1f} ms • p50 {histogram.quantile(0.5) * 1000:.1f} ms • p99 {histogram.quantile(0.99) * 1000:.1f} ms",
+                    inline=False
+                )
+
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+        except Exception as e:
+            globals.log_message(error=e)
+            await interaction.response.send_message("❌ An error occurred while collecting stats.", ephemeral=True)
+
+    profile = app_commands.Group(name="profile", description="Profile live interaction handlers")
+
+    @profile.command(name="start", description="Profile handlers for a time window or a number of interactions")
+    @app_commands.describe(
+        mode="Sampling has almost no overhead; deterministic (cProfile) counts every call",
+        seconds="Stop after this many seconds (default 60)",
+        interactions="Stop after this many interactions instead, if sooner"
+    )
+    @app_commands.choices(mode=[
+        app_commands.Choice(name="Sampling", value="sampling"),
+        app_commands.Choice(name="Deterministic", value="deterministic")
+    ])
+    @metrics.timed("command")
+    async def profile_start(
+        self,
+        interaction: discord.Interaction,
+        mode: app_commands.Choice[str] = None,
+        seconds: app_commands.Range[int, 1, 900] = 60,
+        interactions: app_commands.Range[int, 1, 10000] = None
+    ):
+        try:
+            if interaction.user.id != OWNER_ID:
+                await interaction.response.send_message("❌ You are not authorized to use this command!", ephemeral=True)
+                return
+
+            try:
+                session = profiling.start(mode.value if mode else "sampling", seconds, interactions)
+            except RuntimeError as e:
+                await interaction.response.send_message(f"❌ {e}. Use `/profile stop` first.", ephemeral=True)
+                return
+
+            limit = f"{seconds}s" + (f" or {interactions} interactions" if interactions else "")
+            await interaction.response.send_message(
+                f"🔬 Profiling ({session.mode}) for up to {limit}. Use `/profile stop` to get the report.",
+                ephemeral=True
+            )
+            globals.log_message(message=f"{interaction.user} started a {session.mode} profile for {limit}")
+        except Exception as e:
+            globals.log_message(error=e)
+            await interaction.response.send_message("❌ An error occurred while starting the profiler.", ephemeral=True)
+
+    @profile.command(name="stop", description="Stop profiling and download the report")
+    @metrics.timed("command")
+    async def profile_stop(self, interaction: discord.Interaction):
+        try:
+            if interaction.user.id != OWNER_ID:
+                await interaction.response.send_message("❌ You are not authorized to use this command!", ephemeral=True)
+                return
+
+            if profiling.session is None:
+                await interaction.response.send_message("❌ No profile has been started.", ephemeral=True)
+                return
+
+            # Returns the finished report if the window or interaction limit already ended it
+            report = profiling.session.stop()
+            summary = report.summary if len(report.summary) < 1900 else report.summary[:1900] + "\n…"
+            await interaction.response.send_message(
+                f"```\n{summary}\n```",
+                files=[discord.File(io.BytesIO(data), filename=name) for name, data in report.files],
+                ephemeral=True
+            )
+        except Exception as e:
+            globals.log_message(error=e)
+            await interaction.response.send_message("❌ An error occurred while stopping the profiler.", ephemeral=True)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel: discord.abc.GuildChannel):
+        channel_cache.invalidate(channel.category_id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel):
+        channel_cache.invalidate(channel.category_id)
+        if isinstance(channel, discord.CategoryChannel):
+            channel_cache.invalidate(channel.id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel):
+        # Moving a channel between categories or reordering changes both lists
+        if before.category_id != after.category_id or before.position != after.position or type(before) != type(after):
+            channel_cache.invalidate(before.category_id)
+            channel_cache.invalidate(after.category_id)
+
+    @app_commands.command(name="points", description="View the points leaderboard")
+    @metrics.timed("command")
+    async def points(self, interaction: discord.Interaction):
+        try:
+            if interaction.user.id != OWNER_ID:
+                await interaction.response.send_message("❌ You are not authorized to use this command!", ephemeral=True)
+                return
+
+            if not len(leaderboard):
+                embed = discord.Embed(
+                    title="📊 Points Leaderboard",
+                    description="No scores yet! Answer some questions to get started.",
+                    color=discord.Color.blue()
+                )
+                await interaction.response.send_message(embed=embed)
+                return
             
-            if not user_scores:
-                embed.description = "No scores yet! Answer some questions to get started."
-            else:
-                # Sort by score descending
-                sorted_scores = sorted(user_scores.items(), key=lambda x: x[1], reverse=True)
-                
-                for rank, (user_id, score) in enumerate(sorted_scores, 1):
-                    user = self.bot.get_user(user_id)
-                    username = user.display_name if user else f"User {user_id}"
+            page_count = (len(leaderboard) - 1) // LEADERBOARD_PAGE_SIZE + 1
+            
+            async def render_page(page: int) -> discord.Embed:
+                embed = discord.Embed(
+                    title="📊 Points Leaderboard",
+                    description="Here are the scores of all participants:",
+                    color=discord.Color.blue()
+                )
+                rows = leaderboard.page(page * LEADERBOARD_PAGE_SIZE, LEADERBOARD_PAGE_SIZE)
+                names = await name_resolver.resolve_many(self.bot, [row[1] for row in rows], interaction.guild)
+                for rank, user_id, score in rows:
+                    username = names[user_id]
                     medal = "🥇" if rank == 1 else "🥈" if rank == 2 else "🥉" if rank == 3 else f"{rank}."
                     embed.add_field(
                         name=f"{medal} {username}",
                         value=f"**{score}** points",
                         inline=False
                     )
+                embed.set_footer(text=f"Page {page+1}/{page_count} • {len(leaderboard)} participants")
+                return embed
+            
+            def slow(page: int) -> bool:
+                rows = leaderboard.page(page * LEADERBOARD_PAGE_SIZE, LEADERBOARD_PAGE_SIZE)
+                return not name_resolver.cached(self.bot, [row[1] for row in rows], interaction.guild)
             
-            await interaction.response.send_message(embed=embed)
+            view = PaginationView(page_count=page_count, render=render_page, slow=slow)
+            await view.send(interaction)
         except Exception as e:
             globals.log_message(error=e)
-            await interaction.response.send_message("❌ An error occurred while fetching points.", ephemeral=True)
+            # The first page may have been deferred while names were looked up
+            send = interaction.followup.send if interaction.response.is_done() else interaction.response.send_message
+            await send("❌ An error occurred while fetching points.", ephemeral=True)
 
     @app_commands.command(name="view-answers", description="View all answers submitted")
+    @metrics.timed("command")
     async def view_answers(self, interaction: discord.Interaction):
         try:
             if interaction.user.id != OWNER_ID:
                 await interaction.response.send_message("❌ You are not authorized to use this command!", ephemeral=True)
                 return
             
-            if not user_answers:
+            if not len(answer_store):
                 embed = discord.Embed(
                     title="📝 Submitted Answers",
                     description="No answers submitted yet!",
@@ -459,36 +1206,33 @@ class QuestionCog(commands.Cog):
                 await interaction.response.send_message(embed=embed, ephemeral=True)
                 return
             
-            # Collect all answers with user info
-            all_answers = []
-            for user_id, answers in user_answers.items():
-                user = self.bot.get_user(user_id)
-                username = user.display_name if user else f"User {user_id}"
-                for idx, answer in enumerate(answers, 1):
-                    all_answers.append({
-                        "user_id": user_id,
-                        "username": username,
-                        "index": idx,
-                        "question_id": answer["id"],
-                        "question": answer["question"],
-                        "answer": answer["answer"]
-                    })
+            # Only answer IDs are collected; embeds are built per viewed page
+            all_answers = [
+                answer_id
+                for answer_ids in answer_store.by_user.values()
+                for answer_id in answer_ids
+            ]
             
-            # Create pages (10 answers per page)
+            # 10 answers per page
             ANSWERS_PER_PAGE = 10
-            pages = []
+            page_count = (len(all_answers) - 1) // ANSWERS_PER_PAGE + 1
             
-            for i in range(0, len(all_answers), ANSWERS_PER_PAGE):
+            async def render_page(page: int) -> discord.Embed:
+                i = page * ANSWERS_PER_PAGE
                 embed = discord.Embed(
                     title="📝 Submitted Answers",
                     description=f"Showing answers {i+1}-{min(i+ANSWERS_PER_PAGE, len(all_answers))} of {len(all_answers)}",
                     color=discord.Color.blue()
                 )
                 
-                page_answers = all_answers[i:i+ANSWERS_PER_PAGE]
+                page_answers = [answer_store.get(answer_id) for answer_id in all_answers[i:i+ANSWERS_PER_PAGE]]
+                names = await name_resolver.resolve_many(self.bot, [ans.user_id for ans in page_answers], interaction.guild)
                 for ans in page_answers:
+                    username = names[ans.user_id]
+                    question = self.question_text(ans.question_id)
+                    
                     # Get validation status
-                    status = validation_status.get(ans["user_id"], {}).get(ans["index"], None)
+                    status = ans.status
                     if status == "correct":
                         status_emoji = "✅"
                     elif status == "wrong":
@@ -497,29 +1241,36 @@ class QuestionCog(commands.Cog):
                         status_emoji = "⏳"
                     
                     # Truncate answer if too long
-                    answer_preview = ans["answer"]
+                    answer_preview = ans.text
                     if len(answer_preview) > 100:
                         answer_preview = answer_preview[:100] + "..."
                     
                     embed.add_field(
-                        name=f"{status_emoji} {ans['username']} - Q{ans['question_id']} (Answer #{ans['index']})",
-                        value=f"**Q:** {ans['question'][:80]}{'...' if len(ans['question']) > 80 else ''}\n**A:** {answer_preview}",
+                        name=f"{status_emoji} {username} - Q{ans.question_id} (Answer #{ans.answer_id})",
+                        value=f"**Q:** {question[:80]}{'...' if len(question) > 80 else ''}\n**A:** {answer_preview}",
                         inline=False
                     )
                 
-                embed.set_footer(text=f"Page {len(pages)+1}/{(len(all_answers)-1)//ANSWERS_PER_PAGE + 1} • Use buttons to navigate")
-                pages.append(embed)
+                embed.set_footer(text=f"Page {page+1}/{page_count} • Use buttons to navigate")
+                return embed
+            
+            def slow(page: int) -> bool:
+                answer_ids = all_answers[page * ANSWERS_PER_PAGE:(page + 1) * ANSWERS_PER_PAGE]
+                return not name_resolver.cached(self.bot, [answer_store.get(answer_id).user_id for answer_id in answer_ids], interaction.guild)
             
             # Send with pagination
-            view = PaginationView(pages)
-            await interaction.response.send_message(embed=pages[0], view=view, ephemeral=True)
+            view = PaginationView(page_count=page_count, render=render_page, slow=slow)
+            await view.send(interaction, ephemeral=True)
             
         except Exception as e:
             globals.log_message(error=e)
-            await interaction.response.send_message("❌ An error occurred while fetching answers.", ephemeral=True)
+            # The first page may have been deferred while names were looked up
+            send = interaction.followup.send if interaction.response.is_done() else interaction.response.send_message
+            await send("❌ An error occurred while fetching answers.", ephemeral=True)
 
     @app_commands.command(name="validate-answer", description="Validate answers for a specific question")
     @app_commands.describe(question_id="The question ID to validate answers for")
+    @metrics.timed("command")
     async def validate_answer(self, interaction: discord.Interaction, question_id: int):
         try:
             if interaction.user.id != OWNER_ID:
@@ -527,7 +1278,7 @@ class QuestionCog(commands.Cog):
                 return
             
             # Check if question ID is valid
-            if question_id not in self.questions:
+            if question_id not in self.questions and not answer_store.count(question_id):
                 await interaction.response.send_message(
                     f"❌ Invalid question ID! Please use a question ID between 1 and {len(self.questions)}.",
                     ephemeral=True
@@ -535,125 +1286,148 @@ class QuestionCog(commands.Cog):
                 return
             
             # Find all answers for this question
-            answers_for_question = []
-            for user_id, answers in user_answers.items():
-                for idx, answer in enumerate(answers, 1):
-                    if answer["id"] == question_id:
-                        answers_for_question.append({
-                            "user_id": user_id,
-                            "answer_index": idx,
-                            "answer": answer["answer"]
-                        })
+            answers_for_question = answer_store.answers_for(question_id)
             
             # If no answers found
             if not answers_for_question:
                 embed = discord.Embed(
                     title="❌ Not Answered",
-                    description=f"**Question ID:** {question_id}\n\n**Question:**\n{self.questions[question_id]}\n\n**Status:** No one has answered this question yet.",
+                    description=f"**Question ID:** {question_id}\n\n**Question:**\n{self.question_text(question_id)}\n\n**Status:** No one has answered this question yet.",
                     color=discord.Color.red()
                 )
                 await interaction.response.send_message(embed=embed, ephemeral=True)
                 return
             
-            # Create pages for multiple answers
-            pages = []
-            for ans_data in answers_for_question:
-                user = self.bot.get_user(ans_data["user_id"])
-                username = user.display_name if user else f"User {ans_data['user_id']}"
-                
-                # Check if already validated
-                status = validation_status.get(ans_data["user_id"], {}).get(ans_data["answer_index"], None)
-                status_text = ""
-                if status == "correct":
-                    status_text = "\n\n**⚠️ This answer has already been marked as CORRECT**"
-                elif status == "wrong":
-                    status_text = "\n\n**⚠️ This answer has already been marked as WRONG**"
-                
-                embed = discord.Embed(
-                    title="📋 Answer Validation",
-                    description=f"**User:** {user.mention if user else username}\n**Answer Index:** {ans_data['answer_index']}{status_text}",
-                    color=discord.Color.gold()
-                )
-                embed.add_field(
-                    name=f"Question ID: {question_id}",
-                    value=self.questions[question_id],
-                    inline=False
-                )
-                embed.add_field(
-                    name="📝 Answer",
-                    value=ans_data["answer"],
-                    inline=False
-                )
-                embed.add_field(
-                    name="🎯 Scoring",
-                    value="✅ **Correct:** 2-5 points (you choose)\n❌ **Wrong:** 1 point",
-                    inline=False
-                )
-                embed.set_footer(text=f"Current Score: {user_scores.get(ans_data['user_id'], 0)} points | Answer {len(pages)+1}/{len(answers_for_question)}")
-                
-                pages.append({
-                    "embed": embed,
-                    "user_id": ans_data["user_id"],
-                    "answer_index": ans_data["answer_index"]
-                })
+            # Only the first answer is shown, so only its embed is built
+            answer_id = answers_for_question[0]
+            embed = self.answer_embed(answer_id, f"Answer 1/{len(answers_for_question)}")
             
-            # Send first answer with validation buttons
-            view = ValidationView(pages[0]["user_id"], pages[0]["answer_index"])
-            
-            # If multiple answers, add navigation info
-            if len(pages) > 1:
-                pages[0]["embed"].add_field(
+            # If multiple answers, point at the review queue
+            if len(answers_for_question) > 1:
+                embed.add_field(
                     name="ℹ️ Multiple Answers",
-                    value=f"This question has {len(pages)} answers. Validate this one, then run the command again to see others.",
+                    value=f"This question has {len(answers_for_question)} answers. Use `/review question_id:{question_id}` to grade them one after another.",
                     inline=False
                 )
             
-            await interaction.response.send_message(embed=pages[0]["embed"], view=view)
+            # Send first answer with validation buttons
+            await interaction.response.send_message(embed=embed, view=validation_view(answer_id))
 
         except Exception as e:
             globals.log_message(error=e)
             await interaction.response.send_message("❌ An error occurred while validating the answer.", ephemeral=True)
 
+    @app_commands.command(name="review", description="Grade all pending answers one after another")
+    @app_commands.describe(question_id="Only review answers to this question", user="Only review answers from this member")
+    @metrics.timed("command")
+    async def review(self, interaction: discord.Interaction, question_id: int = None, user: discord.User = None):
+        try:
+            if interaction.user.id != OWNER_ID:
+                await interaction.response.send_message("❌ You are not authorized to use this command!", ephemeral=True)
+                return
+
+            # Build the queue from the per-question index, or the user's own list when filtering by user
+            if user is not None:
+                queue = [
+                    answer.answer_id
+                    for answer in answer_store.for_user(user.id)
+                    if question_id is None or answer.question_id == question_id
+                ]
+            elif question_id is not None:
+                queue = list(answer_store.answers_for(question_id))
+            else:
+                queue = [
+                    answer_id
+                    for q_id in answer_store.answered
+                    for answer_id in answer_store.answers_for(q_id)
+                ]
+            queue = [answer_id for answer_id in queue if not is_validated(answer_id)]
+
+            if not queue:
+                await interaction.response.send_message("✅ No pending answers match those filters.", ephemeral=True)
+                return
+
+            view = ReviewView(self, queue)
+            await interaction.response.send_message(embed=view.render(0), view=view, ephemeral=True)
+            view.prerender()
+
+        except Exception as e:
+            globals.log_message(error=e)
+            await interaction.response.send_message("❌ An error occurred while starting the review.", ephemeral=True)
+
+    @app_commands.command(name="similar-answers", description="Find groups of near-identical answers to a question")
+    @app_commands.describe(question_id="The question to check", threshold="Similarity in percent to flag (default 80)")
+    @metrics.timed("command")
+    async def similar_answers(self, interaction: discord.Interaction, question_id: int, threshold: app_commands.Range[int, 50, 100] = None):
+        try:
+            if interaction.user.id != OWNER_ID:
+                await interaction.response.send_message("❌ You are not authorized to use this command!", ephemeral=True)
+                return
+
+            if not similarity_index.loaded:
+                await interaction.response.send_message("⏳ Answers are still being indexed, try again in a moment.", ephemeral=True)
+                return
+
+            # The array work runs on a worker thread so large questions don't stall the loop
+            clusters = await asyncio.to_thread(
+                similarity_index.clusters, question_id, threshold / 100 if threshold else None
+            )
+            embed = discord.Embed(
+                title="🧬 Similar Answers",
+                description=f"**Question {question_id}:** {self.question_text(question_id)[:200]}\n"
+                            f"{answer_store.count(question_id)} answers, **{len(clusters)}** groups of near-identical ones"
+                            + (f" ({similarity_index.pending} new answers are still being indexed)" if similarity_index.pending else ""),
+                color=discord.Color.orange() if clusters else discord.Color.green()
+            )
+            status_emojis = {"correct": "✅", "wrong": "❌", None: "⏳"}
+            for number, (answer_ids, score) in enumerate(clusters[:10], 1):
+                answers = [answer_store.get(answer_id) for answer_id in answer_ids]
+                members = ", ".join(f"{status_emojis[a.status]} #{a.answer_id} <@{a.user_id}>" for a in answers[:15])
+                if len(answers) > 15:
+                    members += f" and {len(answers) - 15} more"
+                preview = answers[0].text[:150] + ("..." if len(answers[0].text) > 150 else "")
+                embed.add_field(
+                    name=f"Group {number}: {len(answers)} answers, ~{score:.0%} alike",
+                    value=f"{members}\n> {preview}"[:1024],
+                    inline=False
+                )
+            if len(clusters) > 10:
+                embed.set_footer(text=f"Showing the 10 largest of {len(clusters)} groups")
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+        except Exception as e:
+            globals.log_message(error=e)
+            await interaction.response.send_message("❌ An error occurred while comparing answers.", ephemeral=True)
+
+    @similar_answers.autocomplete('question_id')
+    @review.autocomplete('question_id')
     @validate_answer.autocomplete('question_id')
+    @metrics.timed("autocomplete")
     async def question_id_autocomplete(
         self,
         interaction: discord.Interaction,
         current: str,
     ) -> list[app_commands.Choice[int]]:
-        # Get all answered question IDs
-        answered_questions = set()
-        for user_id, answers in user_answers.items():
-            for answer in answers:
-                answered_questions.add(answer["id"])
-        
-        # Convert to sorted list
-        answered_questions = sorted(list(answered_questions))
-        
         # Filter based on current input
-        if current:
-            try:
-                current_int = int(current)
-                filtered = [q for q in answered_questions if str(q).startswith(str(current_int))]
-            except ValueError:
-                filtered = answered_questions
-        else:
-            filtered = answered_questions
+        try:
+            filtered = answer_store.search(str(int(current)) if current else "")
+        except ValueError:
+            filtered = answer_store.search("")
         
         # Return up to 25 choices (Discord limit)
         choices = []
-        for q_id in filtered[:25]:
+        for q_id in filtered:
             # Count how many users answered this question
-            answer_count = sum(1 for user_id, answers in user_answers.items() 
-                             for answer in answers if answer["id"] == q_id)
+            answer_count = answer_store.count(q_id)
+            pending = answer_store.pending.get(q_id, 0)
             
             # Truncate question text for display
-            question_preview = self.questions[q_id]
+            question_preview = self.question_text(q_id)
             if len(question_preview) > 60:
                 question_preview = question_preview[:60] + "..."
             
             choices.append(
                 app_commands.Choice(
-                    name=f"Q{q_id}: {question_preview} ({answer_count} answer{'s' if answer_count != 1 else ''})",
+                    name=f"Q{q_id}: {question_preview} ({answer_count} answer{'s' if answer_count != 1 else ''}, {pending} pending)",
                     value=q_id
                 )
             )
@@ -661,13 +1435,35 @@ class QuestionCog(commands.Cog):
         return choices
 
 
-class AnswerButton(discord.ui.Button):
-    def __init__(self, question: dict):
-        super().__init__(label="Submit Answer", style=discord.ButtonStyle.primary, emoji="✍️")
-        self.question = question
+class AnswerButton(discord.ui.DynamicItem[discord.ui.Button], template=r"noctowl:answer:(?P<question_id>[0-9]+)"):
+    def __init__(self, question_id: int, disabled: bool = False):
+        super().__init__(
+            discord.ui.Button(
+                label="Submit Answer" if not disabled else "Answers Closed",
+                style=discord.ButtonStyle.primary,
+                emoji="✍️",
+                disabled=disabled,
+                custom_id=f"noctowl:answer:{question_id}"
+            )
+        )
+        self.question_id = question_id
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(int(match["question_id"]))
 
+    @metrics.timed("ui")
     async def callback(self, interaction: discord.Interaction):
-        modal = QuestionModal(self.question)
+        # Rejections are answered from memory, without touching the shared message
+        if not open_posts.is_open(interaction.message.id):
+            await interaction.response.send_message("❌ This question is no longer accepting answers.", ephemeral=True)
+            return
+        if answer_store.has_submitted(interaction.user.id, self.question_id):
+            await interaction.response.send_message("❌ You have already answered this question!", ephemeral=True)
+            return
+
+        cog = interaction.client.get_cog("QuestionCog")
+        modal = QuestionModal({"id": self.question_id, "question": cog.question_text(self.question_id)}, interaction.message.id)
         await interaction.response.send_modal(modal)
 
 
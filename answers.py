@@ -0,0 +1,121 @@
+import bisect
+
+
+class Answer:
+    """One submitted answer. The question is referenced by ID; its text lives once in the store."""
+
+    __slots__ = ("answer_id", "user_id", "question_id", "text", "status")
+
+    def __init__(self, answer_id: int, user_id: int, question_id: int, text: str, status=None):
+        self.answer_id = answer_id  # Stable, allocated in submission order
+        self.user_id = user_id
+        self.question_id = question_id
+        self.text = text
+        self.status = status  # None while pending, then "correct" / "wrong"
+
+
+class AnswerStore:
+    """
+    Every answer by its stable ID, plus per-user and per-question indexes kept up to date
+    as answers come in and get validated, so lookups never walk every user's answers.
+    """
+
+    def __init__(self):
+        self.records = {}  # {answer_id: Answer}
+        self.by_user = {}  # {user_id: [answer_id, ...]} in submission order
+        self.by_question = {}  # {question_id: [answer_id, ...]}
+        self.pending = {}  # {question_id: number of answers not validated yet}
+        self.answered = []  # Sorted answered question IDs
+        self.submitted = set()  # {(user_id, question_id)} to reject repeat submissions
+        self.question_texts = {}  # {question_id: text as asked}, for questions removed from the bank since
+        self.last_id = 0
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.records.values())
+
+    def clear(self):
+        self.records.clear()
+        self.by_user.clear()
+        self.by_question.clear()
+        self.pending.clear()
+        self.answered.clear()
+        self.submitted.clear()
+        self.question_texts.clear()
+        self.last_id = 0
+
+    def add(self, answer: Answer, question: str = None) -> Answer:
+        if answer.answer_id in self.records:
+            return self.records[answer.answer_id]
+        self.records[answer.answer_id] = answer
+        self.last_id = max(self.last_id, answer.answer_id)
+        bisect.insort(self.by_user.setdefault(answer.user_id, []), answer.answer_id)
+
+        entries = self.by_question.get(answer.question_id)
+        if entries is None:
+            entries = self.by_question[answer.question_id] = []
+            self.pending[answer.question_id] = 0
+            bisect.insort(self.answered, answer.question_id)
+        entries.append(answer.answer_id)
+        self.submitted.add((answer.user_id, answer.question_id))
+        if answer.status is None:
+            self.pending[answer.question_id] += 1
+        if question is not None:
+            self.question_texts.setdefault(answer.question_id, question)
+        return answer
+
+    def rebuild(self, rows):
+        """Load (answer_id, user_id, question_id, question, answer, status) rows"""
+        self.clear()
+        for answer_id, user_id, question_id, question, text, status in rows:
+            self.add(Answer(answer_id, user_id, question_id, text, status), question)
+
+    def get(self, answer_id: int):
+        return self.records.get(answer_id)
+
+    def set_status(self, answer_id: int, status: str):
+        """Record a verdict; returns the previous status"""
+        answer = self.records[answer_id]
+        previous = answer.status
+        if previous is None and self.pending.get(answer.question_id):
+            self.pending[answer.question_id] -= 1
+        answer.status = status
+        return previous
+
+    def is_validated(self, answer_id: int) -> bool:
+        answer = self.records.get(answer_id)
+        return answer is not None and answer.status is not None
+
+    def for_user(self, user_id: int) -> list:
+        return [self.records[answer_id] for answer_id in self.by_user.get(user_id, ())]
+
+    def has_submitted(self, user_id: int, question_id: int) -> bool:
+        return (user_id, question_id) in self.submitted
+
+    def answers_for(self, question_id: int) -> list:
+        return self.by_question.get(question_id, [])
+
+    def count(self, question_id: int) -> int:
+        return len(self.by_question.get(question_id, ()))
+
+    def search(self, prefix: str, limit: int = 25) -> list:
+        """Answered question IDs whose decimal form starts with prefix, in ascending order"""
+        if not prefix:
+            return self.answered[:limit]
+
+        # IDs starting with "12" are exactly 12, 120-129, 1200-1299, ... so each digit
+        # length is one contiguous slice of the sorted list
+        start = int(prefix)
+        results = []
+        if start <= 0:
+            return results
+        width = 1
+        while len(results) < limit and self.answered and start <= self.answered[-1]:
+            lo = bisect.bisect_left(self.answered, start)
+            hi = bisect.bisect_left(self.answered, start + width)
+            results.extend(self.answered[lo:min(hi, lo + limit - len(results))])
+            start *= 10
+            width *= 10
+        return results
@@ -0,0 +1,231 @@
+"""
+A local stand-in for the Discord gateway and REST API, enough to run the real bot against.
+
+One aiohttp server answers both: the gateway websocket at /gateway and the REST API under
+/api/v10. It serves a single guild with an event category of text channels, assigns IDs
+to whatever the bot creates, and records every REST call by route template. Interactions
+are pushed to the bot over the gateway, and interaction() waits for the bot's callback.
+"""
+import asyncio
+import itertools
+import json
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from aiohttp import web
+
+API_PREFIX = "/api/v10"
+HEARTBEAT_INTERVAL = 41250  # Milliseconds, as Discord sends it
+
+# Gateway opcodes
+DISPATCH, HEARTBEAT, IDENTIFY, RESUME, HELLO, HEARTBEAT_ACK = 0, 1, 2, 6, 10, 11
+
+# Interaction types
+APPLICATION_COMMAND, MESSAGE_COMPONENT, AUTOCOMPLETE, MODAL_SUBMIT = 2, 3, 4, 5
+
+
+def now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def route_template(method: str, path: str) -> str:
+    """"POST /interactions/123/abc/callback" -> "POST /interactions/{id}/{token}/callback" """
+    parts = []
+    for segment in path[len(API_PREFIX):].strip("/").split("/"):
+        if segment.isdigit():
+            parts.append("{id}")
+        elif len(parts) >= 2 and parts[-1] == "{id}" and parts[-2] in ("interactions", "webhooks"):
+            parts.append("{token}")
+        else:
+            parts.append(segment)
+    return f"{method} /{'/'.join(parts)}"
+
+
+class FakeDiscord:
+    def __init__(self, category_id: int, channel_count: int = 5, host: str = "127.0.0.1"):
+        self.host = host
+        self.port = None
+        self._ids = itertools.count(10 ** 18)
+        self.application_id = next(self._ids)
+        self.bot_user = {"id": str(self.application_id), "username": "noctowl", "discriminator": "0000", "avatar": None, "bot": True}
+        self.guild_id = next(self._ids)
+        self.category_id = category_id
+        self.channel_ids = [next(self._ids) for _ in range(channel_count)]
+
+        self.rest_calls = Counter()  # {route template: calls}
+        self.commands = {}  # {command name: command ID}
+        self.question_posts = asyncio.Queue()  # (channel_id, message_id, question_id) of posts with an answer button
+        self.ready = asyncio.Event()
+
+        self._runner = None
+        self._ws = None
+        self._sequence = 0
+        self._pending = {}  # {interaction ID: future of the callback body}
+
+    @property
+    def api_base(self) -> str:
+        return f"http://{self.host}:{self.port}{API_PREFIX}"
+
+    @property
+    def gateway_url(self) -> str:
+        return f"ws://{self.host}:{self.port}/gateway"
+
+    async def start(self):
+        app = web.Application(client_max_size=32 * 1024 * 1024)
+        app.router.add_get("/gateway", self.gateway)
+        app.router.add_route("*", API_PREFIX + "/{path:.*}", self.rest)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, 0)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        for future in self._pending.values():
+            future.cancel()
+        if self._ws is not None:
+            await self._ws.close()
+        if self._runner:
+            await self._runner.cleanup()
+
+    # Payloads
+
+    def user(self, user_id: int, name: str = None) -> dict:
+        return {"id": str(user_id), "username": name or f"user{user_id}", "discriminator": "0", "global_name": None, "avatar": None}
+
+    def member(self, user_id: int) -> dict:
+        return {"user": self.user(user_id), "roles": [], "joined_at": now_iso(), "deaf": False, "mute": False, "flags": 0, "permissions": "0"}
+
+    def message(self, channel_id: int, message_id: int = None, content: str = None, embeds=(), components=()) -> dict:
+        return {
+            "id": str(message_id or next(self._ids)), "channel_id": str(channel_id), "guild_id": str(self.guild_id),
+            "author": self.bot_user, "content": content or "", "timestamp": now_iso(), "edited_timestamp": None,
+            "tts": False, "mention_everyone": False, "mentions": [], "mention_roles": [], "attachments": [],
+            "embeds": list(embeds), "components": list(components), "pinned": False, "type": 0, "flags": 0,
+        }
+
+    def guild(self) -> dict:
+        channels = [{
+            "id": str(self.category_id), "type": 4, "name": "events", "position": 0,
+            "permission_overwrites": [], "guild_id": str(self.guild_id),
+        }]
+        channels += [{
+            "id": str(channel_id), "type": 0, "name": f"questions-{i + 1}", "position": i + 1, "parent_id": str(self.category_id),
+            "permission_overwrites": [], "guild_id": str(self.guild_id), "topic": None, "nsfw": False, "rate_limit_per_user": 0,
+        } for i, channel_id in enumerate(self.channel_ids)]
+        everyone = {
+            "id": str(self.guild_id), "name": "@everyone", "permissions": str((1 << 41) - 1), "position": 0,
+            "color": 0, "hoist": False, "managed": False, "mentionable": False, "flags": 0,
+        }
+        return {
+            "id": str(self.guild_id), "name": "Load Test", "icon": None, "owner_id": str(next(self._ids)),
+            "unavailable": False, "large": False, "member_count": 1, "joined_at": now_iso(),
+            "channels": channels, "roles": [everyone], "emojis": [], "stickers": [], "features": [],
+            "members": [], "voice_states": [], "presences": [], "threads": [], "stage_instances": [],
+            "guild_scheduled_events": [], "premium_tier": 0, "verification_level": 0, "explicit_content_filter": 0,
+            "default_message_notifications": 0, "mfa_level": 0, "nsfw_level": 0, "preferred_locale": "en-US",
+            "afk_timeout": 300, "system_channel_flags": 0,
+        }
+
+    # Gateway
+
+    async def send(self, op: int, data=None, event: str = None):
+        payload = {"op": op, "d": data, "s": None, "t": event}
+        if op == DISPATCH:
+            self._sequence += 1
+            payload["s"] = self._sequence
+        await self._ws.send_str(json.dumps(payload))
+
+    async def gateway(self, request: web.Request) -> web.WebSocketResponse:
+        # Plain text frames; the client only inflates binary ones, so zlib-stream can be ignored
+        ws = web.WebSocketResponse(max_msg_size=0)
+        await ws.prepare(request)
+        self._ws = ws
+        await self.send(HELLO, {"heartbeat_interval": HEARTBEAT_INTERVAL})
+        async for message in ws:
+            payload = json.loads(message.data)
+            if payload["op"] == HEARTBEAT:
+                await self.send(HEARTBEAT_ACK)
+            elif payload["op"] in (IDENTIFY, RESUME):
+                await self.send(DISPATCH, {
+                    "v": 10, "user": self.bot_user, "guilds": [{"id": str(self.guild_id), "unavailable": True}],
+                    "session_id": "loadtest", "resume_gateway_url": self.gateway_url,
+                    "application": {"id": str(self.application_id), "flags": 0},
+                }, "READY")
+                await self.send(DISPATCH, self.guild(), "GUILD_CREATE")
+                self.ready.set()
+        return ws
+
+    async def interaction(self, kind: int, user_id: int, data: dict, channel_id: int = None, message: dict = None, timeout: float = 10):
+        """Send an INTERACTION_CREATE and return (seconds until the bot's callback, callback body)"""
+        interaction_id = next(self._ids)
+        channel_id = channel_id or self.channel_ids[0]
+        payload = {
+            "id": str(interaction_id), "application_id": str(self.application_id), "type": kind, "data": data,
+            "guild_id": str(self.guild_id), "channel_id": str(channel_id), "channel": {"id": str(channel_id), "type": 0},
+            "member": self.member(user_id), "token": f"token{interaction_id}", "version": 1,
+            "app_permissions": str((1 << 41) - 1), "locale": "en-US", "guild_locale": "en-US", "entitlements": [],
+        }
+        if message is not None:
+            payload["message"] = message
+        future = self._pending[interaction_id] = asyncio.get_running_loop().create_future()
+        start = time.perf_counter()
+        try:
+            await self.send(DISPATCH, payload, "INTERACTION_CREATE")
+            body = await asyncio.wait_for(future, timeout)
+            return time.perf_counter() - start, body
+        finally:
+            self._pending.pop(interaction_id, None)
+
+    # REST
+
+    def json(self, data, status: int = 200) -> web.Response:
+        # discord.py only decodes a body whose content type is exactly application/json, without a charset
+        return web.Response(body=json.dumps(data).encode(), status=status, headers={"Content-Type": "application/json"})
+
+    async def rest(self, request: web.Request) -> web.StreamResponse:
+        path = request.path
+        template = route_template(request.method, path)
+        self.rest_calls[template] += 1
+        body = None
+        if request.can_read_body and request.content_type == "application/json":
+            body = await request.json()
+        parts = path[len(API_PREFIX):].strip("/").split("/")
+
+        if template == "POST /interactions/{id}/{token}/callback":
+            future = self._pending.get(int(parts[1]))
+            if future is not None and not future.done():
+                future.set_result(body)
+            return web.Response(status=204)
+        if template == "GET /users/@me":
+            return self.json(self.bot_user)
+        if template == "GET /oauth2/applications/@me":
+            return self.json({
+                "id": str(self.application_id), "name": "noctowl", "icon": None, "description": "", "bot_public": False,
+                "bot_require_code_grant": False, "owner": self.user(next(self._ids), "owner"), "team": None,
+                "verify_key": "0" * 64, "flags": 0, "rpc_origins": [], "summary": "",
+            })
+        if template in ("GET /gateway", "GET /gateway/bot"):
+            return self.json({
+                "url": self.gateway_url, "shards": 1,
+                "session_start_limit": {"total": 1000, "remaining": 1000, "reset_after": 0, "max_concurrency": 1},
+            })
+        if template == "PUT /applications/{id}/commands":
+            commands = []
+            for command in body:
+                command_id = self.commands.setdefault(command["name"], next(self._ids))
+                commands.append({**command, "id": str(command_id), "application_id": str(self.application_id), "version": "1"})
+            return self.json(commands)
+        if template == "POST /channels/{id}/messages":
+            message = self.message(int(parts[1]), content=body.get("content"), embeds=body.get("embeds") or (), components=body.get("components") or ())
+            for row in message["components"]:
+                for component in row.get("components", []):
+                    if component.get("custom_id", "").startswith("noctowl:answer:"):
+                        question_id = int(component["custom_id"].rsplit(":", 1)[1])
+                        self.question_posts.put_nowait((int(parts[1]), int(message["id"]), question_id))
+            return self.json(message)
+        if template == "PATCH /channels/{id}/messages/{id}":
+            return self.json(self.message(int(parts[1]), int(parts[3]), body.get("content"), body.get("embeds") or (), body.get("components") or ()))
+        if template in ("POST /webhooks/{id}/{token}", "PATCH /webhooks/{id}/{token}/messages/@original", "GET /webhooks/{id}/{token}/messages/@original"):
+            return self.json(self.message(self.channel_ids[0], content=(body or {}).get("content")))
+        return self.json({"message": f"{template} is not faked", "code": 0}, status=404)
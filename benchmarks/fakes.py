@@ -0,0 +1,131 @@
+import itertools
+
+_ids = itertools.count(10 ** 17)
+
+
+class FakeUser:
+    def __init__(self, user_id: int, name: str = None):
+        self.id = user_id
+        self.name = name or f"user{user_id}"
+        self.display_name = self.name
+        self.mention = f"<@{user_id}>"
+
+    def __str__(self):
+        return self.name
+
+
+class FakeChannel:
+    def __init__(self, channel_id: int = None, name: str = "questions"):
+        self.id = channel_id or next(_ids)
+        self.name = name
+        self.sent = []
+        self.fetched = []
+
+    async def send(self, content=None, **kwargs):
+        self.sent.append((content, kwargs))
+        return FakeMessage(self)
+
+    async def fetch_message(self, message_id: int):
+        message = FakeMessage(self, message_id)
+        self.fetched.append(message)
+        return message
+
+
+class FakeMessage:
+    def __init__(self, channel: FakeChannel, message_id: int = None):
+        self.id = message_id or next(_ids)
+        self.channel = channel
+        self.edits = []
+
+    async def edit(self, **kwargs):
+        self.edits.append(kwargs)
+
+
+class FakeGuild:
+    """A guild whose member cache holds every user, like the full intent profile"""
+
+    def __init__(self, guild_id: int = None, filesize_limit: int = 10 * 1024 * 1024):
+        self.id = guild_id or next(_ids)
+        self.filesize_limit = filesize_limit
+        self.members = {}
+
+    def get_member(self, user_id: int):
+        member = self.members.get(user_id)
+        if member is None:
+            member = self.members[user_id] = FakeUser(user_id)
+        return member
+
+
+class FakeIntents:
+    members = False
+
+
+class FakeClient:
+    def __init__(self):
+        self.intents = FakeIntents()
+        self.channels = {}
+
+    def get_user(self, user_id: int):
+        return None
+
+    def get_channel(self, channel_id: int):
+        return self.channels.get(channel_id)
+
+    def get_partial_messageable(self, channel_id: int):
+        return self.channels.setdefault(channel_id, FakeChannel(channel_id))
+
+
+class InteractionResponded(Exception):
+    pass
+
+
+class FakeResponse:
+    """Records what a handler sends; responding twice raises like the real library does"""
+
+    def __init__(self):
+        self.calls = []
+        self.kwargs = None
+
+    def is_done(self) -> bool:
+        return bool(self.calls)
+
+    def _respond(self, kind: str, kwargs: dict):
+        if self.calls:
+            raise InteractionResponded(f"{kind} after {self.calls[0]}")
+        self.calls.append(kind)
+        self.kwargs = kwargs
+
+    async def send_message(self, content=None, **kwargs):
+        self._respond("send_message", {"content": content, **kwargs})
+
+    async def edit_message(self, **kwargs):
+        self._respond("edit_message", kwargs)
+
+    async def send_modal(self, modal):
+        self._respond("send_modal", {"modal": modal})
+
+    async def defer(self, **kwargs):
+        self._respond("defer", kwargs)
+
+
+class FakeFollowup:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, content=None, **kwargs):
+        self.sent.append((content, kwargs))
+
+
+class FakeInteraction:
+    def __init__(self, client: FakeClient, user: FakeUser, guild: FakeGuild = None, channel: FakeChannel = None):
+        self.client = client
+        self.user = user
+        self.guild = guild
+        self.channel = channel
+        self.response = FakeResponse()
+        self.followup = FakeFollowup()
+        self.message = FakeMessage(channel) if channel is not None else None  # The message a clicked button is on
+        self.edits = []  # kwargs of each edit_original_response
+
+    async def edit_original_response(self, **kwargs):
+        self.edits.append(kwargs)
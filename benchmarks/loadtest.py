@@ -0,0 +1,268 @@
+"""
+End-to-end load test of the real bot (main.py) against a local fake gateway and REST API.
+
+Starts FakeDiscord, points discord.py at it and starts main.bot with every cog. Each round
+waits for a question post and floods it: every simulated member clicks Submit Answer and
+submits the modal, while the owner types question IDs into the autocomplete and grades
+answers as they come in. Reports throughput, p50/p99 latency (from INTERACTION_CREATE
+being sent until the bot's callback arrives), REST calls per interaction and memory
+growth between rounds. The load generator shares the bot's process and event loop, so
+absolute numbers include its overhead; compare runs on the same machine.
+
+    python -m benchmarks.loadtest                          # 500 members over 5 seconds
+    python -m benchmarks.loadtest --users 2000 --ramp 2 --rounds 3
+"""
+import argparse
+import asyncio
+import contextlib
+import gc
+import io
+import json
+import random
+import resource
+import sys
+import time
+from collections import Counter
+
+from benchmarks.fake_discord import FakeDiscord, AUTOCOMPLETE, MESSAGE_COMPONENT, MODAL_SUBMIT
+from benchmarks.run import prepare_environment, percentile, ErrorCounter
+
+CATEGORY_ID = 4242424242424242424
+OWNER = 1
+KINDS = ("answer_click", "modal_submit", "autocomplete", "grade_click")
+ANSWER_TEXTS = (
+    "I'd timeout them first, purge the spam, warn them and log it in the mod channel.",
+    "Ask for proof, check the logs and only then refund with add-money.",
+    "Politely decline, it wouldn't be fair to everyone else.",
+    "No idea honestly.",
+)
+
+
+def rss_kb() -> int:
+    """Resident memory of this process; falls back to the peak where /proc is missing"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * resource.getpagesize() // 1024
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+class Round:
+    """Drives one question post's flood and collects what the bot's responses took"""
+
+    def __init__(self, fake, event, post, args, rng: random.Random, user_ids):
+        self.fake = fake
+        self.event = event
+        self.channel_id, self.message_id, self.question_id = post
+        self.args = args
+        self.rng = rng
+        self.user_ids = user_ids
+        self.latencies = {kind: [] for kind in KINDS}
+        self.sent = Counter()
+        self.timeouts = Counter()
+        self.members_done = asyncio.Event()
+
+    async def call(self, kind: str, interaction_type: int, user_id: int, data: dict, message: dict = None):
+        self.sent[kind] += 1
+        try:
+            latency, body = await self.fake.interaction(
+                interaction_type, user_id, data, self.channel_id, message, timeout=self.args.timeout
+            )
+        except asyncio.TimeoutError:
+            self.timeouts[kind] += 1
+            return None
+        self.latencies[kind].append(latency)
+        return body
+
+    async def member(self, user_id: int):
+        await asyncio.sleep(self.rng.uniform(0, self.args.ramp))
+        button = {"type": 2, "style": 1, "label": "Submit Answer", "custom_id": f"noctowl:answer:{self.question_id}"}
+        post = self.fake.message(self.channel_id, self.message_id, components=[{"type": 1, "components": [button]}])
+        body = await self.call("answer_click", MESSAGE_COMPONENT, user_id, {"custom_id": button["custom_id"], "component_type": 2}, post)
+        if body is None or body["type"] != 9:
+            return  # Rejected (closed post, already answered) or no response
+
+        modal = body["data"]
+        text_input = modal["components"][0]["components"][0]
+        await asyncio.sleep(self.rng.uniform(0, self.args.think))
+        await self.call("modal_submit", MODAL_SUBMIT, user_id, {
+            "custom_id": modal["custom_id"],
+            "components": [{"type": 1, "components": [{"type": 4, "custom_id": text_input["custom_id"], "value": self.rng.choice(ANSWER_TEXTS)}]}],
+        })
+
+    async def members(self):
+        await asyncio.gather(*(self.member(user_id) for user_id in self.user_ids))
+        self.members_done.set()
+
+    async def autocomplete(self):
+        """The owner typing question IDs a key at a time into /validate-answer"""
+        command_id = self.fake.commands.get("validate-answer", 0)
+        while not self.members_done.is_set():
+            typed = str(self.rng.randint(1, 99))
+            for end in range(len(typed) + 1):
+                await self.call("autocomplete", AUTOCOMPLETE, OWNER, {
+                    "id": str(command_id), "name": "validate-answer", "type": 1,
+                    "options": [{"name": "question_id", "type": 4, "value": typed[:end], "focused": True}],
+                })
+                await asyncio.sleep(self.args.keystroke)
+
+    async def click(self, custom_id: str):
+        """The owner pressing a button on a validation message"""
+        # Dynamic items are only dispatched for buttons present on the interaction's message
+        button = {"type": 2, "style": 1, "label": "Grade", "custom_id": custom_id}
+        message = self.fake.message(self.channel_id, components=[{"type": 1, "components": [button]}])
+        return await self.call("grade_click", MESSAGE_COMPONENT, OWNER, {"custom_id": custom_id, "component_type": 2}, message)
+
+    async def grading(self):
+        """The owner grading new answers as they arrive: Correct, then a points button"""
+        graded = set()
+        while True:
+            done = self.members_done.is_set()
+            pending = [answer_id for answer_id in self.event.answer_store.answers_for(self.question_id) if answer_id not in graded]
+            for answer_id in pending:
+                graded.add(answer_id)
+                if await self.click(f"noctowl:validate:correct:{answer_id}") is not None:
+                    await asyncio.sleep(self.args.grade_delay)
+                    await self.click(f"noctowl:points:{self.rng.randint(2, 5)}:{answer_id}")
+                await asyncio.sleep(self.args.grade_delay)
+            if done:
+                return
+            await asyncio.sleep(0.05)
+
+    async def run(self) -> float:
+        start = time.perf_counter()
+        await asyncio.gather(self.members(), self.autocomplete(), self.grading())
+        return time.perf_counter() - start
+
+
+def summarize(round_: Round, elapsed: float, rest_calls: Counter, memory: tuple, answers: int) -> dict:
+    completed = sum(len(values) for values in round_.latencies.values())
+    result = {
+        "question_id": round_.question_id,
+        "seconds": round(elapsed, 3),
+        "interactions": completed,
+        "throughput_per_s": round(completed / elapsed, 1) if elapsed else 0.0,
+        "rest_calls": sum(rest_calls.values()),
+        "rest_calls_per_interaction": round(sum(rest_calls.values()) / completed, 3) if completed else 0.0,
+        "rest_routes": dict(rest_calls.most_common()),
+        "rss_kb": memory[1],
+        "rss_growth_kb": memory[1] - memory[0],
+        "answers_stored": answers,
+        "kinds": {},
+    }
+    for kind in KINDS:
+        values = sorted(round_.latencies[kind])
+        result["kinds"][kind] = {
+            "sent": round_.sent[kind],
+            "completed": len(values),
+            "timeouts": round_.timeouts[kind],
+            "per_s": round(len(values) / elapsed, 1) if elapsed else 0.0,
+            "p50_ms": round(percentile(values, 0.50) * 1000, 3) if values else None,
+            "p99_ms": round(percentile(values, 0.99) * 1000, 3) if values else None,
+        }
+    return result
+
+
+def print_round(number: int, result: dict):
+    print(f"\nRound {number}: question {result['question_id']}, {result['interactions']} interactions in {result['seconds']}s "
+          f"({result['throughput_per_s']}/s)")
+    print(f"  {'interaction':<16}{'sent':>8}{'done':>8}{'timeouts':>10}{'per s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for kind, stats in result["kinds"].items():
+        print(f"  {kind:<16}{stats['sent']:>8}{stats['completed']:>8}{stats['timeouts']:>10}{stats['per_s']:>10}"
+              f"{str(stats['p50_ms']):>10}{str(stats['p99_ms']):>10}")
+    print(f"  REST calls: {result['rest_calls']} ({result['rest_calls_per_interaction']} per interaction)")
+    for route, calls in result["rest_routes"].items():
+        print(f"    {calls:>8}  {route}")
+    print(f"  Memory: {result['rss_kb'] / 1024:.1f} MB RSS ({result['rss_growth_kb'] / 1024:+.1f} MB), "
+          f"{result['answers_stored']} answers stored")
+
+
+async def until_ready(fake, bot, bot_task: asyncio.Task, timeout: float):
+    """Wait for the bot's READY, or raise whatever stopped it from getting there"""
+    await asyncio.wait([bot_task, asyncio.ensure_future(fake.ready.wait())], timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+    if bot_task.done():
+        bot_task.result()
+        raise RuntimeError("The bot stopped before connecting")
+    if not fake.ready.is_set():
+        raise TimeoutError("The bot did not connect to the fake gateway")
+    await asyncio.wait_for(bot.wait_until_ready(), timeout)
+
+
+async def run(args) -> int:
+    import yarl
+    import discord
+    from discord.gateway import DiscordWebSocket
+
+    fake = FakeDiscord(CATEGORY_ID, args.channels)
+    await fake.start()
+    discord.http.Route.BASE = fake.api_base
+    DiscordWebSocket.DEFAULT_GATEWAY = yarl.URL(fake.gateway_url)
+
+    # The banner and startup status lines would bury the report
+    with contextlib.redirect_stdout(io.StringIO()):
+        import main
+        import globals
+        errors = ErrorCounter()
+        globals.logger.addHandler(errors)
+        bot_task = asyncio.create_task(main.bot.start(globals.Secrets.TOKEN))
+        await until_ready(fake, main.bot, bot_task, args.timeout * 3)
+
+    event = sys.modules["Cogs.event"]
+    event.OWNER_ID = OWNER
+    rng = random.Random(args.seed)
+    user_ids = iter(range(10 ** 15, 10 ** 16))
+    results = []
+    try:
+        for number in range(1, args.rounds + 1):
+            post = await asyncio.wait_for(fake.question_posts.get(), args.timeout * 3)
+            gc.collect()
+            memory_before = rss_kb()
+            calls_before = fake.rest_calls.copy()
+
+            round_ = Round(fake, event, post, args, rng, [next(user_ids) for _ in range(args.users)])
+            elapsed = await round_.run()
+
+            gc.collect()
+            result = summarize(round_, elapsed, fake.rest_calls - calls_before, (memory_before, rss_kb()), len(event.answer_store))
+            results.append(result)
+            print_round(number, result)
+
+            if number < args.rounds:
+                # Post the next question now rather than after the normal 30-60 minute wait
+                cog = main.bot.get_cog("QuestionCog")
+                cog.scheduler.schedule(cog.scheduler.configs[CATEGORY_ID], 0)
+    finally:
+        with contextlib.redirect_stdout(io.StringIO()):
+            await main.bot.close()
+            await asyncio.gather(bot_task, return_exceptions=True)
+        await fake.stop()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if errors.records:
+        print(f"\n{len(errors.records)} errors logged by the bot, first: {errors.records[0].getMessage()}")
+        return 1
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=500, help="Members answering each question")
+    parser.add_argument("--ramp", type=float, default=5.0, help="Seconds over which the members arrive")
+    parser.add_argument("--think", type=float, default=2.0, help="Longest pause between opening the modal and submitting it")
+    parser.add_argument("--keystroke", type=float, default=0.1, help="Pause between the owner's autocomplete keystrokes")
+    parser.add_argument("--grade-delay", type=float, default=0.01, help="Pause between the owner's grading clicks")
+    parser.add_argument("--rounds", type=int, default=1, help="Question posts to flood one after another")
+    parser.add_argument("--channels", type=int, default=5, help="Text channels in the event category")
+    parser.add_argument("--timeout", type=float, default=10.0, help="Seconds to wait for each interaction response")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Also write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    prepare_environment(event_categories=[CATEGORY_ID])
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,384 @@
+"""
+Offline benchmarks for the event cog's interaction handlers.
+
+Drives on_submit, validate-answer, the question ID autocomplete, the grading buttons,
+/points and /view-answers with fake Discord objects against a synthetic dataset, and
+reports latency percentiles and peak memory per handler. The grading scenarios also check
+that every click is answered with exactly one interaction response, fewer Discord calls
+than the flow it replaced. Exits with status 1 when a result regresses past the stored
+baseline.
+
+    python -m benchmarks.run                       # 1k and 100k answers, 10k users
+    python -m benchmarks.run --answers 1000000     # one size only
+    python -m benchmarks.run --update-baseline     # record the current results
+"""
+import argparse
+import asyncio
+import atexit
+import itertools
+import json
+import logging
+import math
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_FILE = os.path.join(REPO_DIR, "benchmarks", "baselines.json")
+DEFAULT_SIZES = [1_000, 100_000]
+DEFAULT_USERS = 10_000
+OWNER = 1
+# Discord calls per grading in the flow before one response per click, measured by driving
+# that version's buttons through these fakes. Wrong replied, then edited the buttons. Correct
+# sent an ephemeral point picker; a points click then posted to the channel, replied, edited
+# the picker, fetched the validation message and edited it.
+GRADING_CALLS_BEFORE = {"grade_wrong": 2, "grade_correct": 6}
+
+
+def prepare_environment(**config):
+    """
+    The bot reads secrets.json and config.json from the working directory on import, so
+    run from a scratch directory with a dummy token, in-memory storage and quiet logging.
+    Keyword arguments are added to config.json.
+    """
+    directory = tempfile.mkdtemp(prefix="noctowl-bench-")
+    with open(os.path.join(directory, "secrets.json"), "w") as f:
+        json.dump({"BOT_TOKEN": "benchmark"}, f)
+    with open(os.path.join(directory, "config.json"), "w") as f:
+        json.dump({
+            "log_level": "error",
+            "log_console": "off",
+            "storage_backend": "memory",
+            "question_bank": os.path.join(REPO_DIR, "questions.json"),
+            **config,
+        }, f)
+    # main.py loads cogs from ./Cogs
+    os.symlink(os.path.join(REPO_DIR, "Cogs"), os.path.join(directory, "Cogs"))
+    os.chdir(directory)
+    atexit.register(shutil.rmtree, directory, ignore_errors=True)
+    sys.path.insert(0, REPO_DIR)
+    return directory
+
+
+class ErrorCounter(logging.Handler):
+    """Handlers swallow and log their exceptions, so a failing benchmark shows up here"""
+
+    def __init__(self):
+        super().__init__(logging.ERROR)
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class Benchmark:
+    def __init__(self, answers: int, users: int, seed: int = 0):
+        from Cogs import event
+        from benchmarks import fakes
+
+        self.event = event
+        self.fakes = fakes
+        self.answers = answers
+        self.users = users
+        self.rng = random.Random(seed)
+        self.client = fakes.FakeClient()
+        self.guild = fakes.FakeGuild()
+        self.channel = fakes.FakeChannel()
+        self.owner = fakes.FakeUser(OWNER, "owner")
+        event.OWNER_ID = OWNER
+        self.cog = event.QuestionCog(self.client)
+        self.submitters = iter(range(10 ** 12, 10 ** 13))
+        self.new_answers = itertools.count(answers + 1)
+
+    def build_dataset(self) -> int:
+        """Fill the module state with synthetic answers; returns the memory it took in bytes"""
+        event = self.event
+        event.answer_store.clear()
+        event.user_scores.clear()
+        event.leaderboard.clear()
+        event.name_resolver._cache.clear()
+
+        question_ids = list(self.cog.questions)
+        # Every (user, question) pair is unique, so extra synthetic questions are needed past users * bank size
+        question_count = max(len(question_ids), math.ceil(self.answers / self.users))
+        question_ids += range(max(question_ids) + 1, max(question_ids) + 1 + question_count - len(question_ids))
+
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        for answer_id in range(1, self.answers + 1):
+            user_id = 10 ** 6 + answer_id % self.users
+            question_id = question_ids[(answer_id - 1) // self.users]
+            status = self.rng.choice((None, None, "correct", "wrong"))
+            event.answer_store.add(
+                event.Answer(answer_id, user_id, question_id, f"Synthetic answer {answer_id} " * 4, status),
+                f"Synthetic question {question_id}"
+            )
+            if status is not None:
+                event.user_scores[user_id] = event.user_scores.get(user_id, 0) + (1 if status == "wrong" else 3)
+        event.leaderboard.rebuild(event.user_scores)
+        used = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+        return used
+
+    def interaction(self, user=None):
+        return self.fakes.FakeInteraction(self.client, user or self.owner, self.guild, self.channel)
+
+    def random_question(self) -> int:
+        return self.rng.choice(self.event.answer_store.answered)
+
+    def ungraded_answer(self) -> int:
+        """A fresh answer to grade, so no click finds it already validated"""
+        event = self.event
+        answer_id = next(self.new_answers)
+        answer = event.answer_store.add(
+            event.Answer(answer_id, 10 ** 6 + answer_id % self.users, self.random_question(), "A fresh answer to grade"),
+            "Benchmark question"
+        )
+        event.db.save_answer(answer, "Benchmark question")
+        return answer_id
+
+    @staticmethod
+    def discord_calls(interactions) -> int:
+        """Every call the handlers made: responses, followups, edits, channel messages and fetches"""
+        calls = 0
+        for interaction in interactions:
+            calls += len(interaction.response.calls) + len(interaction.followup.sent) + len(interaction.edits)
+            calls += len(interaction.message.edits) if interaction.message else 0
+        for channel in {id(interaction.channel): interaction.channel for interaction in interactions}.values():
+            calls += len(channel.sent) + len(channel.fetched) + sum(len(message.edits) for message in channel.fetched)
+        return calls
+
+    def expect_responses(self, scenario: str, interactions):
+        """Each grading click gets one edit_message and nothing else, fewer calls than GRADING_CALLS_BEFORE"""
+        responses = [call for interaction in interactions for call in interaction.response.calls]
+        calls = self.discord_calls(interactions)
+        before = GRADING_CALLS_BEFORE[scenario]
+        if responses != ["edit_message"] * len(interactions) or calls != len(interactions) or calls >= before:
+            raise AssertionError(
+                f"{scenario}: expected {len(interactions)} Discord calls (one edit_message per click, down from {before}), "
+                f"got {calls} with responses {responses}"
+            )
+
+    # Each scenario returns (setup, run): setup is untimed and its result is passed to run
+
+    def on_submit(self):
+        event = self.event
+        message_id = 1
+        question_id = self.random_question()
+        event.open_posts.posts[message_id] = {
+            "channel_id": self.channel.id, "question_id": question_id, "closes_at": None, "answers": 0
+        }
+
+        def setup():
+            modal = event.QuestionModal({"id": question_id, "question": "Benchmark question"}, message_id)
+            modal.answer._value = "A benchmark answer that is about as long as a real one tends to be."
+            return modal, self.interaction(self.fakes.FakeUser(next(self.submitters)))
+
+        async def run(args):
+            modal, interaction = args
+            await modal.on_submit(interaction)
+
+        return setup, run
+
+    def validate_answer(self):
+        def setup():
+            return self.interaction(), self.random_question()
+
+        async def run(args):
+            interaction, question_id = args
+            await self.cog.validate_answer.callback(self.cog, interaction, question_id)
+
+        return setup, run
+
+    def autocomplete(self):
+        def setup():
+            return self.interaction(), str(self.random_question())[:self.rng.randint(0, 2)]
+
+        async def run(args):
+            interaction, current = args
+            await self.cog.question_id_autocomplete(interaction, current)
+
+        return setup, run
+
+    def grade_wrong(self):
+        """❌ Wrong: one click, one response"""
+        def setup():
+            answer_id = self.ungraded_answer()
+            button = self.event.ValidationButton("wrong", answer_id)
+            return button, self.fakes.FakeInteraction(self.client, self.owner, self.guild, self.fakes.FakeChannel())
+
+        async def run(args):
+            button, interaction = args
+            await button.callback(interaction)
+            self.expect_responses("grade_wrong", [interaction])
+
+        return setup, run
+
+    def grade_correct(self):
+        """✅ Correct, then a points button: two clicks, two responses"""
+        def setup():
+            answer_id = self.ungraded_answer()
+            buttons = self.event.ValidationButton("correct", answer_id), self.event.PointsButton(self.rng.randint(2, 5), answer_id)
+            interactions = [self.fakes.FakeInteraction(self.client, self.owner, self.guild, self.fakes.FakeChannel()) for _ in buttons]
+            return buttons, interactions
+
+        async def run(args):
+            buttons, interactions = args
+            for button, interaction in zip(buttons, interactions):
+                await button.callback(interaction)
+            self.expect_responses("grade_correct", interactions)
+
+        return setup, run
+
+    def paginated(self, command):
+        """The command's first page plus a jump to a random page, as a reader would browse"""
+        def setup():
+            return self.interaction(), self.interaction()
+
+        async def run(args):
+            interaction, jump = args
+            await command.callback(self.cog, interaction)
+            view = interaction.response.kwargs["view"]
+            await view.show_page(jump, self.rng.randrange(view.max_pages))
+            view.stop()
+
+        return setup, run
+
+    def points(self):
+        return self.paginated(self.cog.points)
+
+    def view_answers(self):
+        return self.paginated(self.cog.view_answers)
+
+    SCENARIOS = ("on_submit", "validate_answer", "autocomplete", "grade_wrong", "grade_correct", "points", "view_answers")
+
+    async def measure(self, name: str, iterations: int, memory_iterations: int) -> dict:
+        setup, run = getattr(self, name)()
+        timings = []
+        for _ in range(iterations):
+            args = setup()
+            start = time.perf_counter()
+            await run(args)
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+
+        # Memory is traced in a separate pass since tracing slows every allocation down
+        tracemalloc.start()
+        base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        for _ in range(memory_iterations):
+            await run(setup())
+        peak = tracemalloc.get_traced_memory()[1] - base
+        tracemalloc.stop()
+
+        return {
+            "p50_ms": round(percentile(timings, 0.50) * 1000, 4),
+            "p95_ms": round(percentile(timings, 0.95) * 1000, 4),
+            "p99_ms": round(percentile(timings, 0.99) * 1000, 4),
+            "peak_kb": round(peak / 1024, 1),
+        }
+
+
+async def run_size(answers: int, users: int, iterations: int, memory_iterations: int, scenarios) -> dict:
+    bench = Benchmark(answers, users)
+    results = {"dataset_kb": round(bench.build_dataset() / 1024, 1)}
+    for name in scenarios:
+        results[name] = await bench.measure(name, iterations, memory_iterations)
+    return results
+
+
+def compare(results: dict, baselines: dict, tolerance: float, slack_ms: float, slack_kb: float) -> list:
+    """Metrics that got worse than baseline * (1 + tolerance) plus a small absolute slack for noise"""
+    regressions = []
+    for size, scenarios in results.items():
+        base = baselines.get(size)
+        if base is None:
+            continue
+        if "dataset_kb" in base and scenarios["dataset_kb"] > base["dataset_kb"] * (1 + tolerance) + slack_kb:
+            regressions.append(f"{size} dataset: {scenarios['dataset_kb']} KB vs {base['dataset_kb']} KB")
+        for name, metrics in scenarios.items():
+            if name == "dataset_kb" or name not in base:
+                continue
+            # p99 of a few hundred samples is one or two outliers, too noisy to gate on
+            for metric in ("p50_ms", "p95_ms", "peak_kb"):
+                slack = slack_kb if metric == "peak_kb" else slack_ms
+                if metrics[metric] > base[name][metric] * (1 + tolerance) + slack:
+                    regressions.append(f"{size} {name} {metric}: {metrics[metric]} vs {base[name][metric]}")
+    return regressions
+
+
+def print_results(size: str, results: dict):
+    print(f"\n{size} (dataset {results['dataset_kb']} KB)")
+    print(f"  {'handler':<18}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'peak KB':>12}")
+    for name, metrics in results.items():
+        if name == "dataset_kb":
+            continue
+        print(f"  {name:<18}{metrics['p50_ms']:>10}{metrics['p95_ms']:>10}{metrics['p99_ms']:>10}{metrics['peak_kb']:>12}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--answers", type=int, action="append", help="Dataset size in answers (repeatable)")
+    parser.add_argument("--users", type=int, default=DEFAULT_USERS)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--memory-iterations", type=int, default=20)
+    parser.add_argument("--scenario", action="append", choices=Benchmark.SCENARIOS, help="Only run these handlers")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--update-baseline", action="store_true", help="Store these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="Allowed relative slowdown (0.5 = 50%%)")
+    parser.add_argument("--slack-ms", type=float, default=0.1)
+    parser.add_argument("--slack-kb", type=float, default=16)
+    args = parser.parse_args(argv)
+
+    prepare_environment()
+    import globals
+    errors = ErrorCounter()
+    globals.logger.addHandler(errors)
+
+    results = {}
+    for answers in args.answers or DEFAULT_SIZES:
+        size = f"{answers}x{args.users}"
+        results[size] = asyncio.run(run_size(
+            answers, args.users, args.iterations, args.memory_iterations, args.scenario or Benchmark.SCENARIOS
+        ))
+        print_results(size, results[size])
+
+    if errors.records:
+        print(f"\n{len(errors.records)} handler errors, first: {errors.records[0].getMessage()}")
+        return 1
+
+    baselines = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r") as f:
+            baselines = json.load(f)
+
+    if args.update_baseline:
+        for size, scenarios in results.items():
+            baselines.setdefault(size, {}).update(scenarios)
+        with open(args.baseline, "w") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+
+    regressions = compare(results, baselines, args.tolerance, args.slack_ms, args.slack_kb)
+    if regressions:
+        print("\nRegressions against the baseline:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print("\nNo regressions against the baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
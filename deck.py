@@ -0,0 +1,70 @@
+import random
+
+
+class QuestionDeck:
+    """
+    Draws questions without replacement from a pre-shuffled order.
+
+    Drawing just advances a cursor, and (seed, cursor, order) is all the state needed to
+    resume after a restart, so questions don't repeat after a redeploy. The order only
+    changes on reconcile(), so a draw only needs the cursor saved again.
+    """
+
+    __slots__ = ("seed", "cursor", "order")
+
+    def __init__(self, order: list, seed: int, cursor: int = 0):
+        self.order = order
+        self.seed = seed
+        self.cursor = cursor
+
+    @classmethod
+    def shuffled(cls, question_ids, seed: int = None):
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        order = sorted(question_ids)
+        random.Random(seed).shuffle(order)
+        return cls(order, seed)
+
+    def __len__(self):
+        return len(self.order)
+
+    @property
+    def remaining(self) -> int:
+        return len(self.order) - self.cursor
+
+    def draw(self):
+        """Next question ID, or None once every question has been drawn"""
+        if self.cursor >= len(self.order):
+            return None
+        question_id = self.order[self.cursor]
+        self.cursor += 1
+        return question_id
+
+    def undraw(self):
+        """Put the last drawn question back, e.g. when posting it failed"""
+        if self.cursor:
+            self.cursor -= 1
+
+    def reconcile(self, question_ids) -> bool:
+        """
+        Follow a changed question set: drop removed IDs from the undrawn part and shuffle new ones in.
+        Returns whether the order changed.
+        """
+        question_ids = set(question_ids)
+        known = set(self.order)
+        remaining = [q for q in self.order[self.cursor:] if q in question_ids]
+        added = sorted(question_ids - known)
+        if not added and len(remaining) == self.remaining:
+            return False
+        rng = random.Random(self.seed + len(self.order))
+        for question_id in added:
+            remaining.insert(rng.randint(0, len(remaining)), question_id)
+        self.order = self.order[:self.cursor] + remaining
+        return True
+
+    def to_dict(self) -> dict:
+        return {"seed": self.seed, "cursor": self.cursor, "order": self.order}
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        return cls(list(data["order"]), data["seed"], data["cursor"])
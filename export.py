@@ -0,0 +1,92 @@
+import csv
+import gzip
+import io
+import json
+import os
+import tempfile
+
+DEFAULT_SIZE_LIMIT = 10 * 1024 * 1024  # Discord's attachment limit without boosts
+SIZE_MARGIN = 0.9  # zlib buffers output, so rotate before the limit is actually reached
+
+
+class ChunkWriter:
+    """
+    Streams rows into gzip-compressed CSV or JSONL files, starting a new file whenever
+    the compressed size nears the limit. Only one row is held in memory at a time.
+    """
+
+    def __init__(self, directory: str, basename: str, fields: list, fmt: str = "csv", size_limit: int = DEFAULT_SIZE_LIMIT):
+        if fmt not in ("csv", "jsonl"):
+            raise ValueError(f"Unknown export format: {fmt}")
+        self.directory = directory
+        self.basename = basename
+        self.fields = fields
+        self.fmt = fmt
+        self.size_limit = int(size_limit * SIZE_MARGIN)
+        self.paths = []
+        self.rows = 0
+        self._raw = None
+        self._gzip = None
+        self._text = None
+        self._csv = None
+
+    def _open(self):
+        path = os.path.join(self.directory, f"{self.basename}-part{len(self.paths) + 1}.{self.fmt}.gz")
+        self.paths.append(path)
+        self._raw = open(path, "wb")
+        self._gzip = gzip.GzipFile(fileobj=self._raw, mode="wb")
+        self._text = io.TextIOWrapper(self._gzip, encoding="utf-8", newline="")
+        if self.fmt == "csv":
+            self._csv = csv.writer(self._text)
+            self._csv.writerow(self.fields)
+
+    def _close(self):
+        if self._text is not None:
+            self._text.close()  # Closes the gzip stream too, which writes the trailer
+            self._raw.close()
+            self._raw = self._gzip = self._text = self._csv = None
+
+    def write(self, row: dict):
+        if self._raw is None:
+            self._open()
+        if self.fmt == "csv":
+            self._csv.writerow([row.get(field) for field in self.fields])
+        else:
+            self._text.write(json.dumps(row, ensure_ascii=False))
+            self._text.write("\n")
+        self.rows += 1
+
+        if self._raw.tell() >= self.size_limit:
+            self._close()
+
+    def close(self) -> list:
+        if not self.paths:
+            self._open()  # An empty export still produces a file with the header
+        self._close()
+        return self.paths
+
+
+def write_export(rows, basename: str, fields: list, fmt: str = "csv", size_limit: int = DEFAULT_SIZE_LIMIT):
+    """
+    Write rows to chunked gzip files in a new temporary directory.
+    Returns (directory, paths, row count); the caller removes the directory when done.
+    If the rows raise, the directory is removed here and the error propagates.
+    """
+    directory = tempfile.mkdtemp(prefix="noctowl-export-")
+    writer = ChunkWriter(directory, basename, fields, fmt, size_limit)
+    completed = False
+    try:
+        for row in rows:
+            writer.write(row)
+        completed = True
+    finally:
+        paths = writer.close()
+        if not completed:
+            remove_export(directory)
+    return directory, paths, writer.rows
+
+
+def remove_export(directory: str):
+    for name in os.listdir(directory):
+        os.remove(os.path.join(directory, name))
+    os.rmdir(directory)
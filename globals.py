@@ -3,12 +3,19 @@ from datetime import datetime, timezone
 import traceback
 from colorama import Fore
 import os
+import sys
 import json
+import queue
+import atexit
+import logging
+import logging.handlers
 from typing import Mapping, Any
 
 WORKING_DIR = os.getcwd().replace("\\", "/")
 
-def load_json(file_path: str) -> Mapping[str, Any]:
+def load_json(file_path: str, default: Mapping[str, Any] = None) -> Mapping[str, Any]:
+    if default is not None and not os.path.exists(file_path):
+        return default
     try:
         with open(file_path, "r") as f:
             return json.load(f)
@@ -16,21 +23,40 @@ def load_json(file_path: str) -> Mapping[str, Any]:
         raise Exception(f"base.py file error: {e}")
 
 _secrets = load_json(os.path.join(WORKING_DIR, "secrets.json"))
+_config = load_json(os.path.join(WORKING_DIR, "config.json"), default={})
 
 class Secrets:
     TOKEN = _secrets["BOT_TOKEN"]
 
-def log_message(message=None, action="debug", error=None):
-    """
-    Logs a formatted log message with a specified action type.
+class Config:
+    """Optional settings read from config.json; every key has a default"""
+    LOG_LEVEL = _config.get("log_level", "debug")  # debug / info / warn / error
+    LOG_CONSOLE = _config.get("log_console", "auto")  # pretty / json / off / auto (pretty on a terminal)
+    LOG_FILE = _config.get("log_file")  # JSON lines file, rotated; disabled when unset
+    LOG_FILE_MAX_BYTES = _config.get("log_file_max_bytes", 10 * 1024 * 1024)
+    LOG_FILE_BACKUPS = _config.get("log_file_backups", 5)
+    EVENT_CATEGORIES = _config.get("event_categories", [])  # Category IDs to run question events in
+    QUESTION_BANK = _config.get("question_bank", os.path.join(WORKING_DIR, "questions.json"))
+    EVENT_QUESTION_CATEGORIES = _config.get("event_question_categories", {})  # {"<category id>": ["economy", ...]}
+    QUESTION_SEED = _config.get("question_seed")  # Fixed shuffle seed for question decks; random when unset
+    INTENT_PROFILE = _config.get("intent_profile", "minimal")  # minimal (guilds only) / full (everything but presences)
+    MAX_MESSAGES = _config.get("max_messages")  # Message cache size; overrides the profile default when set
+    STORAGE_BACKEND = _config.get("storage_backend", "sqlite")  # sqlite / shared-sqlite (several shard processes) / memory
+    DATABASE_FILE = _config.get("database_file", "event.db")
+    SHARD_COUNT = _config.get("shard_count")  # Total shards across all processes; unsharded when unset
+    SHARD_IDS = _config.get("shard_ids")  # Shards this process runs, e.g. [0, 1]; all of them when unset
+    METRICS_PORT = _config.get("metrics_port")  # Port for the Prometheus /metrics endpoint; disabled when unset
+    METRICS_HOST = _config.get("metrics_host", "127.0.0.1")
 
-    Parameters:
-        message (str): The message to log.
-        action (str): The type of action (e.g., 'debug', 'info', 'warn', 'error').
-                     Default is 'debug'.
-        error (optional): The error object or message to log.
-    """
-    action = action.lower()
+LEVELS = {
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "warn": logging.WARNING,
+    "error": logging.ERROR,
+}
+
+class BoxFormatter(logging.Formatter):
+    """The colored box layout used on interactive consoles"""
 
     emojis = {
         "debug": "🐛",
@@ -46,39 +72,111 @@ def log_message(message=None, action="debug", error=None):
         "error": Fore.RED,
     }
 
-    emoji = emojis.get(action, "🔍")
-    color = colors.get(action, Fore.CYAN)
+    def format(self, record):
+        action = record.action
+        emoji = self.emojis.get(action, "🔍")
+        color = self.colors.get(action, Fore.CYAN)
+        timestamp = datetime.fromtimestamp(record.created, timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
 
-    timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        if record.exc_info:
+            body = ''.join(traceback.format_exception(*record.exc_info))
+        else:
+            body = record.getMessage()
 
-    if error:
-        if isinstance(error, discord.errors.NotFound):
-            action = 'warn'
-            color = Fore.YELLOW
-            error_message = "Unrecognized interaction detected; event safely ignored!"
-        else:    
-            color = Fore.RED
-            action = 'error'
-            if isinstance(error, str):
-                error_message = f"The error is in String format so couldn't do traceback.\nError: {error}"
-            else:
-                error_message = ''.join(traceback.format_exception(type(error), error, error.__traceback__))
-        formatted_message = (
+        return (
             f"{color}╔════════════════════════════════════════════════════════════╗\n"
             f"║ {emoji} [{action.upper()}] {timestamp} - [BOT] ║\n"
             f"╟────────────────────────────────────────────────────────────╢\n"
-            f"║ {error_message}\n"
+            f"║ {body}\n"
             f"╚════════════════════════════════════════════════════════════╝"
         )
-    elif message:
-        formatted_message = (
-            f"{color}╔════════════════════════════════════════════════════════════╗\n"
-            f"║ {emoji} [{action.upper()}] {timestamp} - [BOT] ║\n"
-            f"╟────────────────────────────────────────────────────────────╢\n"
-            f"║ {message}\n"
-            f"╚════════════════════════════════════════════════════════════╝"
+
+class JsonFormatter(logging.Formatter):
+    """One compact JSON object per line, for files and log collectors"""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": logging.getLevelName(record.levelno).lower(),
+            "action": record.action,
+            "msg": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["error"] = ''.join(traceback.format_exception(*record.exc_info))
+        return json.dumps(entry, ensure_ascii=False)
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """Queues the raw record; formatting and tracebacks are rendered by the listener thread"""
+
+    def prepare(self, record):
+        return record
+
+def _build_handlers():
+    handlers = []
+
+    console = Config.LOG_CONSOLE
+    if console == "auto":
+        console = "pretty" if sys.stdout.isatty() else "json"
+    if console != "off":
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(BoxFormatter() if console == "pretty" else JsonFormatter())
+        handlers.append(handler)
+
+    if Config.LOG_FILE:
+        handler = logging.handlers.RotatingFileHandler(
+            Config.LOG_FILE,
+            maxBytes=Config.LOG_FILE_MAX_BYTES,
+            backupCount=Config.LOG_FILE_BACKUPS,
+            encoding="utf-8"
         )
-    else:
-        formatted_message = f"{Fore.RED}╔════════════════════════════════════════════════════════════╗\n║ ❌ [ERROR] {timestamp} - No Log Message has been passed in the function - ║\n╚════════════════════════════════════════════════════════════╝"
+        handler.setFormatter(JsonFormatter())
+        handlers.append(handler)
+
+    return handlers
+
+logger = logging.getLogger("noctowl")
+logger.setLevel(LEVELS.get(Config.LOG_LEVEL.lower(), logging.DEBUG))
+logger.propagate = False
+
+_log_queue = queue.SimpleQueue()
+logger.addHandler(_DeferredQueueHandler(_log_queue))
+_listener = logging.handlers.QueueListener(_log_queue, *_build_handlers(), respect_handler_level=True)
+_listener.start()
+atexit.register(_listener.stop)
+
+def log_message(message=None, action="debug", error=None):
+    """
+    Logs a formatted log message with a specified action type.
+
+    The record is handed to a background listener thread, which does the formatting
+    and the actual I/O. Messages below Config.LOG_LEVEL are dropped immediately.
+
+    Parameters:
+        message (str): The message to log.
+        action (str): The type of action (e.g., 'debug', 'info', 'warn', 'error').
+                     Default is 'debug'.
+        error (optional): The error object or message to log.
+    """
+    action = action.lower()
+    exc_info = None
+
+    if error:
+        if isinstance(error, discord.errors.NotFound):
+            action = 'warn'
+            message = "Unrecognized interaction detected; event safely ignored!"
+        else:
+            action = 'error'
+            if isinstance(error, str):
+                message = f"The error is in String format so couldn't do traceback.\nError: {error}"
+            else:
+                exc_info = (type(error), error, error.__traceback__)
+                message = str(error)
+    elif not message:
+        action = 'error'
+        message = "No Log Message has been passed in the function"
+
+    level = LEVELS.get(action, logging.DEBUG)
+    if not logger.isEnabledFor(level):
+        return
 
-    print(formatted_message)
\ No newline at end of file
+    logger.log(level, "%s", message, exc_info=exc_info, extra={"action": action})
@@ -0,0 +1,49 @@
+from sortedcontainers import SortedList
+
+
+class Leaderboard:
+    """
+    Scores kept in rank order as they change.
+
+    Entries are stored as (-score, user_id) keys in a SortedList, so updates and rank
+    lookups are logarithmic and page queries cost log n plus the page size; nothing is
+    re-sorted per command.
+    """
+
+    def __init__(self):
+        self.scores = {}  # {user_id: score}
+        self._keys = SortedList()  # [(-score, user_id)]
+
+    def __len__(self):
+        return len(self._keys)
+
+    def clear(self):
+        self.scores.clear()
+        self._keys.clear()
+
+    def rebuild(self, scores: dict):
+        self.scores = dict(scores)
+        self._keys = SortedList((-score, user_id) for user_id, score in self.scores.items())
+
+    def update(self, user_id: int, score: int):
+        old = self.scores.get(user_id)
+        if old == score:
+            return
+        if old is not None:
+            self._keys.remove((-old, user_id))
+        self.scores[user_id] = score
+        self._keys.add((-score, user_id))
+
+    def rank(self, user_id: int):
+        """1-based position of the user, or None if they have no score. Ties are ordered by user ID."""
+        score = self.scores.get(user_id)
+        if score is None:
+            return None
+        return self._keys.bisect_left((-score, user_id)) + 1
+
+    def page(self, start: int, count: int) -> list:
+        """[(rank, user_id, score)] for positions start .. start+count-1 (0-based)"""
+        return [
+            (rank, user_id, -neg_score)
+            for rank, (neg_score, user_id) in enumerate(self._keys.islice(start, start + count), start + 1)
+        ]
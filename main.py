@@ -2,24 +2,53 @@ import discord
 from discord.ext import commands
 import asyncio
 import os
+import json
+import hashlib
 from colorama import Fore, Back, Style, init
 import globals
+import metrics
 from datetime import datetime
-import time
 
 # Initialize colorama
 init(autoreset=True)
 
-class CustomBot(commands.Bot):
+COMMAND_SYNC_FILE = ".command_sync.json"  # Fingerprint of the last synced command tree
+
+# One process can run every shard, or several processes can split them with shard_ids
+BotBase = commands.AutoShardedBot if globals.Config.SHARD_COUNT else commands.Bot
+
+# Processes splitting the shards must share answer IDs; any other backend allocates them per
+# process, and two processes would silently overwrite each other's answers
+if (globals.Config.SHARD_IDS is not None
+        and set(globals.Config.SHARD_IDS) != set(range(globals.Config.SHARD_COUNT or 1))
+        and globals.Config.STORAGE_BACKEND.lower() != "shared-sqlite"):
+    raise SystemExit(
+        f'shard_ids {globals.Config.SHARD_IDS} splits the shards over several processes, which needs '
+        f'storage_backend "shared-sqlite" (configured: "{globals.Config.STORAGE_BACKEND}")'
+    )
+
+class CustomBot(BotBase):
     async def process_commands(self, message):
         ctx = await self.get_context(message)
         if ctx.command is None:
             return
         await self.invoke(ctx)
 
+    async def setup_hook(self):
+        # Runs once after login and before connecting to the gateway
+        print_section_header("🚀 BOT INITIALIZATION", Fore.MAGENTA)
+        await start_metrics(self)
+        await load_cogs()
+        await sync_commands()
+
+    async def close(self):
+        loop_lag.stop()
+        await metrics_server.stop()
+        await super().close()
+
 def clear_screen():
     """Clear the console screen"""
-    os.system('cls' if os.name == 'nt' else 'clear')
+    print("\033[2J\033[H", end="", flush=True)
 
 def print_banner():
     """Print an attractive banner"""
@@ -63,18 +92,38 @@ def print_info_box(title, content, color=Fore.BLUE):
     
     print(f"└{'─' * max_width}┘{Style.RESET_ALL}")
 
-def print_loading_animation(message, duration=2):
+async def print_loading_animation(message, duration=2):
     """Print a loading animation"""
     chars = "⠋⠙⠹⠸⠼⠴⠦⠧⠇⠏"
     for i in range(duration * 10):
         print(f"\r{Fore.YELLOW}{chars[i % len(chars)]} {message}...", end="", flush=True)
-        time.sleep(0.1)
+        await asyncio.sleep(0.1)
     print(f"\r{Fore.GREEN}✓ {message} complete!{Style.RESET_ALL}")
 
+def build_cache_profile(profile):
+    """Intents, member cache flags and message cache size for an intent profile"""
+    if profile == "full":
+        intents = discord.Intents.all()
+        intents.presences = False
+        return intents, discord.MemberCacheFlags.from_intents(intents), 1000
+
+    # The event only needs guild channels and interactions; members are resolved on demand
+    intents = discord.Intents.none()
+    intents.guilds = True
+    return intents, discord.MemberCacheFlags.none(), None
+
 # Bot setup
-intents = discord.Intents.all()
-intents.presences = False
-bot = commands.Bot(command_prefix="?", intents=intents)
+intents, member_cache_flags, max_messages = build_cache_profile(globals.Config.INTENT_PROFILE)
+if globals.Config.MAX_MESSAGES is not None:
+    max_messages = globals.Config.MAX_MESSAGES
+bot = CustomBot(
+    command_prefix="?",
+    intents=intents,
+    member_cache_flags=member_cache_flags,
+    max_messages=max_messages,
+    chunk_guilds_at_startup=False,
+    **({"shard_count": globals.Config.SHARD_COUNT, "shard_ids": globals.Config.SHARD_IDS} if globals.Config.SHARD_COUNT else {})
+)
 bot.help_command = None
 bot.case_insensitive = True
 bot_start = False
@@ -83,24 +132,35 @@ bot_start = False
 async def on_ready():
     global bot_start
     
-    if not bot_start:
-        clear_screen()
-        print_banner()
-    
     if bot_start:
         print_section_header("🔄 BOT RECONNECTION", Fore.YELLOW)
         print_status_line("RECONNECT", "Bot reconnected successfully!", Fore.GREEN)
     else:
-        print_section_header("🚀 BOT INITIALIZATION", Fore.MAGENTA)
-        
-        await load_cogs()
         bot_start = True
 
         print_section_header("✅ STARTUP COMPLETE", Fore.GREEN)
         print_status_line("READY", "Bot is now online and ready!", Fore.GREEN)
 
+@bot.event
+async def on_shard_ready(shard_id):
+    print_status_line("SHARD", f"Shard {shard_id + 1}/{bot.shard_count} connected", Fore.GREEN)
+
+loop_lag = metrics.LoopLagMonitor()
+metrics_server = metrics.MetricsServer(globals.Config.METRICS_HOST, globals.Config.METRICS_PORT)
+
+async def start_metrics(client):
+    """Count REST calls, sample event loop lag and serve /metrics when a port is configured"""
+    metrics.instrument_http(client.http)
+    loop_lag.start()
+    if globals.Config.METRICS_PORT:
+        try:
+            await metrics_server.start()
+            print_status_line("METRICS", f"Serving http://{metrics_server.host}:{metrics_server.port}/metrics", Fore.GREEN)
+        except OSError as e:
+            print_status_line("METRICS", f"Could not listen on port {metrics_server.port}: {e}", Fore.RED)
+
 async def load_cogs():
-    """Load cogs from the Cogs folder with enhanced output"""
+    """Load cogs from the Cogs folder concurrently with enhanced output"""
     cogs_folder = "./Cogs"
     
     if not os.path.isdir(cogs_folder):
@@ -114,16 +174,42 @@ async def load_cogs():
         print_status_line("COGS", "No cog files found", Fore.YELLOW)
         return
 
-    for file in cog_files:
-        try:
-            await bot.load_extension(f"Cogs.{file[:-3]}")
+    results = await asyncio.gather(
+        *(bot.load_extension(f"Cogs.{file[:-3]}") for file in cog_files),
+        return_exceptions=True
+    )
+    for file, result in zip(cog_files, results):
+        if isinstance(result, commands.ExtensionError):
+            print_status_line("COG", f"Extension error in {file}: {result}", Fore.RED)
+        elif isinstance(result, Exception):
+            print_status_line("COG", f"Failed to load {file}: {result}", Fore.RED)
+        else:
             print_status_line("COG", f"Loaded {file}", Fore.GREEN)
-        except commands.ExtensionError as e:
-            print_status_line("COG", f"Extension error in {file}: {e}", Fore.RED)
-        except Exception as e:
-            print_status_line("COG", f"Failed to load {file}: {e}", Fore.RED)
+
+def command_tree_fingerprint():
+    """Hash of the application commands as they would be sent to Discord"""
+    payload = [command.to_dict(bot.tree) for command in bot.tree.get_commands()]
+    payload.sort(key=lambda command: (command.get("type", 1), command["name"]))
+    data = json.dumps({"application_id": bot.application_id, "commands": payload}, sort_keys=True)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+async def sync_commands():
+    """Sync slash commands only when the command tree changed since the last sync"""
+    fingerprint = command_tree_fingerprint()
+    try:
+        with open(COMMAND_SYNC_FILE, "r") as f:
+            cached = json.load(f).get("fingerprint")
+    except (OSError, ValueError):
+        cached = None
+
+    if cached == fingerprint:
+        print_status_line("SLASH", "Command tree unchanged, skipping sync", Fore.MAGENTA)
+        return
+
     try:
         synced = await bot.tree.sync()
+        with open(COMMAND_SYNC_FILE, "w") as f:
+            json.dump({"fingerprint": fingerprint}, f)
         print_status_line("SLASH", f"Synced {len(synced)} slash commands", Fore.MAGENTA)
     except Exception as e:
         print_status_line("SLASH", f"Failed to sync commands: {e}", Fore.RED)
@@ -132,6 +218,8 @@ async def load_cogs():
 async def main():
     """Main function with error handling"""
     try:
+        clear_screen()
+        print_banner()
         print_section_header("🔑 AUTHENTICATION", Fore.YELLOW)
         print_status_line("TOKEN", "Authenticating with Discord...", Fore.YELLOW)
         
@@ -0,0 +1,273 @@
+import asyncio
+import bisect
+import contextvars
+import functools
+import logging
+import time
+from contextlib import asynccontextmanager
+from aiohttp import web
+import discord
+import globals
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PREFIX = "noctowl_"
+
+HELP = {
+    "handler_seconds": ("histogram", "Time spent in app commands, UI callbacks and scheduler runs"),
+    "handler_errors_total": ("counter", "Errors raised or logged while a handler was running"),
+    "rest_request_seconds": ("histogram", "Outbound Discord REST requests, including rate limit waits"),
+    "rest_requests_total": ("counter", "Outbound Discord REST requests by route and result"),
+    "event_loop_lag_seconds": ("histogram", "How late the event loop woke up a sleeping task"),
+    "event_loop_lag_last_seconds": ("gauge", "Most recent event loop lag sample"),
+}
+
+_current_handler = contextvars.ContextVar("current_handler", default=None)  # (kind, handler) being run
+HANDLER_CODES = {}  # {code object: handler label} of every timed() callback, so profilers can attribute frames
+handler_hook = None  # Called with (kind, handler, seconds) after each handler run while set
+
+
+class Histogram:
+    """Cumulative bucket counts in the Prometheus layout"""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Estimate by interpolating inside the bucket, like PromQL's histogram_quantile"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if seen + count >= rank and count:
+                lower = self.buckets[i - 1] if i else 0.0
+                if i == len(self.buckets):
+                    return lower  # Past the last bucket all that is known is the lower bound
+                return lower + (self.buckets[i] - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+
+class Registry:
+    """Counters, gauges and histograms keyed by (name, labels)"""
+
+    def __init__(self):
+        self.started = time.time()
+        self.counters = {}  # {(name, labels): value}
+        self.gauges = {}
+        self.histograms = {}  # {(name, labels): Histogram}
+
+    @staticmethod
+    def _key(name: str, labels: dict):
+        return name, tuple(sorted(labels.items()))
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        key = self._key(name, labels)
+        self.counters[key] = self.counters.get(key, 0) + amount
+
+    def set(self, name: str, value: float, **labels):
+        self.gauges[self._key(name, labels)] = value
+
+    def observe(self, name: str, value: float, **labels):
+        key = self._key(name, labels)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram()
+        histogram.observe(value)
+
+    def series(self, name: str):
+        """[(labels dict, Histogram or value)] for one metric"""
+        source = self.histograms if HELP[name][0] == "histogram" else self.counters if HELP[name][0] == "counter" else self.gauges
+        return [(dict(labels), value) for (metric, labels), value in source.items() if metric == name]
+
+    def render(self) -> str:
+        """Everything in the Prometheus text exposition format"""
+        lines = []
+        for name, (kind, description) in HELP.items():
+            series = self.series(name)
+            if not series:
+                continue
+            lines.append(f"# HELP {PREFIX}{name} {description}")
+            lines.append(f"# TYPE {PREFIX}{name} {kind}")
+            for labels, value in series:
+                if kind != "histogram":
+                    lines.append(f"{PREFIX}{name}{_labels(labels)} {value}")
+                    continue
+                cumulative = 0
+                for bound, count in zip(value.buckets + (float("inf"),), value.counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f"{PREFIX}{name}_bucket{_labels({**labels, 'le': le})} {cumulative}")
+                lines.append(f"{PREFIX}{name}_sum{_labels(labels)} {value.sum}")
+                lines.append(f"{PREFIX}{name}_count{_labels(labels)} {value.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+registry = Registry()
+
+
+@asynccontextmanager
+async def track(kind: str, handler: str):
+    """Time the block as one handler run; errors raised out of it, or logged inside it, are counted"""
+    token = _current_handler.set((kind, handler))
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        registry.inc("handler_errors_total", kind=kind, handler=handler)
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        registry.observe("handler_seconds", elapsed, kind=kind, handler=handler)
+        _current_handler.reset(token)
+        if handler_hook is not None:
+            handler_hook(kind, handler, elapsed)
+
+
+def timed(kind: str, handler: str = None):
+    """Decorator form of track() for coroutine callbacks; the handler label defaults to the qualified name"""
+    def decorator(func):
+        name = handler or func.__qualname__
+        HANDLER_CODES[func.__code__] = name
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            async with track(kind, name):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class _LoggedErrors(logging.Handler):
+    """Handlers catch their own exceptions and log them, so count errors where they are logged"""
+
+    def __init__(self):
+        super().__init__(logging.ERROR)
+
+    def emit(self, record):
+        current = _current_handler.get()
+        if current is not None:
+            registry.inc("handler_errors_total", kind=current[0], handler=current[1])
+
+
+globals.logger.addHandler(_LoggedErrors())
+
+
+@asynccontextmanager
+async def _rest_request(route: discord.http.Route):
+    start = time.perf_counter()
+    result = "ok"
+    try:
+        yield
+    except discord.HTTPException as e:
+        result = str(e.status)
+        raise
+    except Exception:
+        result = "error"
+        raise
+    finally:
+        registry.observe("rest_request_seconds", time.perf_counter() - start, method=route.method, route=route.path)
+        registry.inc("rest_requests_total", method=route.method, route=route.path, result=result)
+
+
+def instrument_http(http: discord.http.HTTPClient):
+    """
+    Count and time every REST request by its route template (e.g. /channels/{channel_id}/messages).
+    Interaction responses, followups and their edits bypass the client and go through
+    discord.py's webhook adapter, so that is wrapped as well.
+    """
+    request = http.request
+
+    @functools.wraps(request)
+    async def counted(route: discord.http.Route, **kwargs):
+        async with _rest_request(route):
+            return await request(route, **kwargs)
+
+    http.request = counted
+    instrument_webhooks()
+
+
+def instrument_webhooks():
+    """Count requests made through discord.py's webhook adapter; it is shared, so patch the class once"""
+    adapter = discord.webhook.async_.AsyncWebhookAdapter
+    if getattr(adapter.request, "counted", False):
+        return
+    request = adapter.request
+
+    @functools.wraps(request)
+    async def counted(self, route: discord.http.Route, *args, **kwargs):
+        async with _rest_request(route):
+            return await request(self, route, *args, **kwargs)
+
+    counted.counted = True
+    adapter.request = counted
+
+
+class LoopLagMonitor:
+    """Sleeps for a fixed interval and records how much later than asked the loop woke it"""
+
+    def __init__(self, interval: float = 0.5):
+        self.interval = interval
+        self._task = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - start - self.interval)
+            registry.observe("event_loop_lag_seconds", lag)
+            registry.set("event_loop_lag_last_seconds", lag)
+
+
+class MetricsServer:
+    """Serves registry.render() at /metrics for a Prometheus scraper"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 9108):
+        self.host = host
+        self.port = port
+        self._runner = None
+
+    async def metrics(self, request: web.Request) -> web.Response:
+        return web.Response(text=registry.render(), content_type="text/plain", charset="utf-8")
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/metrics", self.metrics)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
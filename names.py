@@ -0,0 +1,112 @@
+import asyncio
+import time
+from collections import OrderedDict
+import discord
+import globals
+
+QUERY_CHUNK_SIZE = 100  # Gateway member queries accept at most 100 user IDs
+
+
+class NameResolver:
+    """
+    Display names for user IDs, shared by every embed builder.
+
+    Names live in a bounded LRU with a TTL. Misses are resolved in batches of one gateway
+    member query per 100 IDs, but Discord only answers those with the members intent, so
+    batching needs the "full" intent profile. Under the default "minimal" profile each miss
+    costs a fetch_member REST call (plus fetch_user if the user left), made concurrently;
+    callers responding to an interaction should check cached() and defer first when it's
+    False. IDs that can't be resolved are cached as misses for a shorter time so they
+    aren't fetched again on every render.
+    """
+
+    def __init__(self, ttl: float = 600, negative_ttl: float = 120, max_size: int = 5000):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_size = max_size
+        self._cache = OrderedDict()  # {user_id: (display_name or None, expires_at)}
+
+    @staticmethod
+    def fallback(user_id: int) -> str:
+        return f"User {user_id}"
+
+    def _lookup(self, user_id: int):
+        """(hit, name); name is None for a cached miss"""
+        entry = self._cache.get(user_id)
+        if entry is None:
+            return False, None
+        if entry[1] < time.monotonic():
+            del self._cache[user_id]
+            return False, None
+        self._cache.move_to_end(user_id)
+        return True, entry[0]
+
+    def get(self, user_id: int):
+        """Cached name or None, never hits the API"""
+        return self._lookup(user_id)[1]
+
+    def remember(self, user_id: int, name):
+        ttl = self.ttl if name is not None else self.negative_ttl
+        self._cache[user_id] = (name, time.monotonic() + ttl)
+        self._cache.move_to_end(user_id)
+        while len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+
+    def _local(self, client: discord.Client, user_id: int, guild: discord.Guild = None):
+        """(hit, name) from the name cache or the client's own caches, never hits the API"""
+        hit, name = self._lookup(user_id)
+        if not hit:
+            user = (guild.get_member(user_id) if guild else None) or client.get_user(user_id)
+            if user is not None:
+                hit, name = True, user.display_name
+                self.remember(user_id, name)
+        return hit, name
+
+    def cached(self, client: discord.Client, user_ids, guild: discord.Guild = None) -> bool:
+        """Whether resolve_many() can answer for these IDs without any API calls"""
+        return all(self._local(client, user_id, guild)[0] for user_id in user_ids)
+
+    async def resolve_many(self, client: discord.Client, user_ids, guild: discord.Guild = None) -> dict:
+        names = {}
+        missing = []
+        for user_id in dict.fromkeys(user_ids):
+            hit, name = self._local(client, user_id, guild)
+            if not hit:
+                missing.append(user_id)
+                continue
+            names[user_id] = name or self.fallback(user_id)
+
+        if missing:
+            fetched = await self._fetch(client, missing, guild)
+            for user_id in missing:
+                name = fetched.get(user_id)
+                self.remember(user_id, name)
+                names[user_id] = name or self.fallback(user_id)
+
+        return names
+
+    async def _fetch(self, client: discord.Client, user_ids: list, guild: discord.Guild = None) -> dict:
+        found = {}
+        try:
+            if guild is not None and client.intents.members:
+                for i in range(0, len(user_ids), QUERY_CHUNK_SIZE):
+                    chunk = user_ids[i:i + QUERY_CHUNK_SIZE]
+                    members = await guild.query_members(user_ids=chunk, limit=len(chunk), cache=False)
+                    found.update((member.id, member.display_name) for member in members)
+            elif guild is not None:
+                results = await asyncio.gather(
+                    *(guild.fetch_member(user_id) for user_id in user_ids),
+                    return_exceptions=True
+                )
+                found.update(
+                    (member.id, member.display_name) for member in results if isinstance(member, discord.Member)
+                )
+        except (discord.HTTPException, asyncio.TimeoutError) as e:
+            globals.log_message(error=e)
+
+        # Users who left the guild (or lookups without a guild) fall back to the global profile
+        left = [user_id for user_id in user_ids if user_id not in found]
+        if left:
+            results = await asyncio.gather(*(client.fetch_user(user_id) for user_id in left), return_exceptions=True)
+            found.update((user.id, user.display_name) for user in results if isinstance(user, discord.User))
+        return found
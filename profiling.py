@@ -0,0 +1,166 @@
+import asyncio
+import cProfile
+import io
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+import metrics
+
+SAMPLE_INTERVAL = 0.005
+INTERACTION_KINDS = ("command", "autocomplete", "ui")
+
+
+class ProfileReport:
+    def __init__(self, summary: str, files: list):
+        self.summary = summary
+        self.files = files  # [(filename, bytes)]
+
+
+class ProfileSession:
+    """
+    Profiles the event loop thread until a time limit or a number of interactions is reached.
+
+    "sampling" mode reads the loop thread's stack from a side thread every few milliseconds
+    and produces collapsed stacks (flamegraph.pl / speedscope input); the loop itself runs
+    unmodified. "deterministic" mode runs cProfile on the loop thread and produces a pstats
+    file, at a much higher overhead. Either way, time is attributed to the timed handler
+    each stack is inside of.
+    """
+
+    def __init__(self, mode: str = "sampling", duration: float = 60, max_interactions: int = None,
+                 interval: float = SAMPLE_INTERVAL):
+        if mode not in ("sampling", "deterministic"):
+            raise ValueError(f"Unknown profiling mode: {mode}")
+        self.mode = mode
+        self.duration = duration
+        self.max_interactions = max_interactions
+        self.interval = interval
+        self.started = None
+        self.interactions = 0
+        self.handlers = {}  # {handler: [runs, wall seconds]}
+        self.report = None
+
+        self._thread_id = None
+        self._stopping = threading.Event()
+        self._sampler = None
+        self._profile = None
+        self._timer = None
+        self._stacks = Counter()  # {"outer;...;inner": samples}
+        self._handler_samples = Counter()  # {handler or None: samples}
+        self._labels = {}  # {code object: frame label}
+
+    @property
+    def running(self) -> bool:
+        return self.started is not None and self.report is None
+
+    def start(self):
+        """Call from the event loop thread"""
+        self.started = time.monotonic()
+        self._thread_id = threading.get_ident()
+        metrics.handler_hook = self._on_handler
+        if self.mode == "sampling":
+            self._sampler = threading.Thread(target=self._sample, name="profiler", daemon=True)
+            self._sampler.start()
+        else:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        self._timer = asyncio.get_running_loop().call_later(self.duration, self.stop)
+
+    def stop(self) -> ProfileReport:
+        if self.report is not None:
+            return self.report
+        if metrics.handler_hook == self._on_handler:
+            metrics.handler_hook = None
+        if self._timer:
+            self._timer.cancel()
+        if self._profile:
+            self._profile.disable()
+        if self._sampler:
+            self._stopping.set()
+            self._sampler.join()
+        self.report = self._build_report(time.monotonic() - self.started)
+        return self.report
+
+    def _on_handler(self, kind: str, handler: str, seconds: float):
+        entry = self.handlers.setdefault(handler, [0, 0.0])
+        entry[0] += 1
+        entry[1] += seconds
+        if kind in INTERACTION_KINDS:
+            self.interactions += 1
+            if self.max_interactions and self.interactions >= self.max_interactions:
+                self.stop()
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            # Semicolons separate frames in the collapsed format
+            name = getattr(code, "co_qualname", code.co_name)
+            label = f"{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(";", ":")
+            self._labels[code] = label
+        return label
+
+    def _sample(self):
+        while not self._stopping.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            stack = []
+            handler = None
+            while frame is not None:
+                code = frame.f_code
+                if handler is None:
+                    handler = metrics.HANDLER_CODES.get(code)
+                stack.append(self._label(code))
+                frame = frame.f_back
+            frame = None
+            if stack:
+                stack.reverse()
+                self._stacks[";".join(stack)] += 1
+                self._handler_samples[handler] += 1
+
+    def _handler_profile_times(self, stats: pstats.Stats) -> dict:
+        """Cumulative profiled seconds of each timed handler function"""
+        codes = {(code.co_filename, code.co_firstlineno, code.co_name): name for code, name in metrics.HANDLER_CODES.items()}
+        return {codes[key]: entry[3] for key, entry in stats.stats.items() if key in codes}
+
+    def _build_report(self, elapsed: float) -> ProfileReport:
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        lines = [f"{self.mode.capitalize()} profile over {elapsed:.1f}s, {self.interactions} interactions"]
+        files = []
+
+        if self.mode == "sampling":
+            total = sum(self._handler_samples.values())
+            attributed = {name: count * self.interval for name, count in self._handler_samples.items() if name}
+            column = "sampled"
+            idle = self._handler_samples.get(None, 0)
+            lines.append(f"{total} samples every {self.interval * 1000:.0f} ms; {idle} outside any handler")
+            collapsed = "".join(f"{stack} {count}\n" for stack, count in self._stacks.most_common())
+            files.append((f"profile-{stamp}.collapsed", collapsed.encode("utf-8")))
+        else:
+            stats = pstats.Stats(self._profile)
+            attributed = self._handler_profile_times(stats)
+            column = "profiled"
+            files.append((f"profile-{stamp}.pstats", marshal.dumps(stats.stats)))
+            text = io.StringIO()
+            pstats.Stats(self._profile, stream=text).sort_stats("cumulative").print_stats(40)
+            files.append((f"profile-{stamp}.txt", text.getvalue().encode("utf-8")))
+
+        handlers = sorted(set(self.handlers) | set(attributed), key=lambda name: attributed.get(name, 0), reverse=True)
+        for name in handlers:
+            runs, wall = self.handlers.get(name, (0, 0.0))
+            lines.append(f"{name}: {runs} runs, {wall * 1000:.1f} ms wall, {attributed.get(name, 0) * 1000:.1f} ms {column}")
+        return ProfileReport("\n".join(lines), files)
+
+
+session = None  # The current or most recent ProfileSession
+
+
+def start(mode: str = "sampling", duration: float = 60, max_interactions: int = None) -> ProfileSession:
+    global session
+    if session is not None and session.running:
+        raise RuntimeError("A profile is already running")
+    session = ProfileSession(mode, duration, max_interactions)
+    session.start()
+    return session
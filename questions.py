@@ -0,0 +1,95 @@
+import json
+from rubric import RubricIndex
+
+
+class QuestionBank:
+    """
+    Questions loaded from a JSON file, indexed by ID and by category.
+
+    The file is read by load(), which the cog calls on a worker thread at startup, or
+    otherwise on first use. It is a list of {"id", "category", "question"}
+    objects under a "questions" key, each with an optional "rubric" of terms a good answer
+    mentions (see RubricIndex). The bank behaves like a read-only {id: text} mapping.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._questions = None  # {question_id: text}
+        self._by_category = None  # {category: [question_id, ...]}
+        self._rubrics = None  # RubricIndex over every question's rubric
+
+    def load(self):
+        """Read and index the file now; raises ValueError if it is malformed"""
+        with open(self.path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        questions = {}
+        by_category = {}
+        rubrics = RubricIndex()
+        for entry in data.get("questions", []):
+            try:
+                question_id = int(entry["id"])
+                text = str(entry["question"])
+            except (KeyError, TypeError, ValueError):
+                raise ValueError(f"Invalid question entry in {self.path}: {entry!r}")
+            if question_id in questions:
+                raise ValueError(f"Duplicate question ID {question_id} in {self.path}")
+            category = entry.get("category", "general")
+            questions[question_id] = text
+            by_category.setdefault(category, []).append(question_id)
+            rubric = entry.get("rubric")
+            if rubric is not None:
+                if not isinstance(rubric, list):
+                    raise ValueError(f"Rubric of question {question_id} in {self.path} must be a list")
+                rubrics.add(question_id, rubric)
+
+        self._questions, self._by_category = questions, by_category
+        self._rubrics = rubrics.build()
+        return self
+
+    def _ensure_loaded(self):
+        if self._questions is None:
+            self.load()
+
+    @property
+    def questions(self) -> dict:
+        self._ensure_loaded()
+        return self._questions
+
+    def __getitem__(self, question_id: int) -> str:
+        return self.questions[question_id]
+
+    def __contains__(self, question_id) -> bool:
+        return question_id in self.questions
+
+    def __len__(self) -> int:
+        return len(self.questions)
+
+    def __iter__(self):
+        return iter(self.questions)
+
+    def keys(self):
+        return self.questions.keys()
+
+    def get(self, question_id: int, default=None):
+        return self.questions.get(question_id, default)
+
+    def categories(self) -> list:
+        self._ensure_loaded()
+        return sorted(self._by_category)
+
+    def ids(self, categories=None) -> list:
+        """Question IDs, optionally only those in the given categories"""
+        if not categories:
+            return list(self.questions)
+        self._ensure_loaded()
+        return [question_id for category in categories for question_id in self._by_category.get(category, [])]
+
+    @property
+    def rubrics(self) -> RubricIndex:
+        self._ensure_loaded()
+        return self._rubrics
+
+    def score_answer(self, question_id: int, text: str):
+        """RubricScore of an answer against its question's rubric, or None without one"""
+        return self.rubrics.score(question_id, text)
@@ -0,0 +1,147 @@
+import re
+
+_SEPARATORS = re.compile(r"[^a-z0-9]+")
+
+
+def normalize(text: str) -> str:
+    """Lowercase words separated by single spaces and padded with one, so "/Add-Money!" becomes " add money " """
+    return f" {_SEPARATORS.sub(' ', text.lower()).strip()} "
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over many phrases at once.
+
+    Phrases and text go through normalize(), and phrases keep their padding spaces, so
+    only whole words match ("ban" does not match "banner") and punctuation or hyphens
+    don't matter ("add-money" matches "add money"). find() reads the text once no matter
+    how many phrases were added.
+    """
+
+    def __init__(self):
+        self._goto = [{}]  # {char: node} per node
+        self._fail = [0]
+        self._output = [[]]  # Values of the phrases ending at each node, including via fail links
+        self._built = False
+
+    def add(self, phrase: str, value):
+        if self._built:
+            raise RuntimeError("Phrases can't be added after build()")
+        node = 0
+        for char in normalize(phrase):
+            following = self._goto[node].get(char)
+            if following is None:
+                following = len(self._goto)
+                self._goto[node][char] = following
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            node = following
+        self._output[node].append(value)
+
+    def build(self):
+        """Link every node to its longest proper suffix that is also a prefix, breadth first"""
+        queue = list(self._goto[0].values())
+        for node in queue:
+            for char, following in self._goto[node].items():
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[following] = self._goto[fallback].get(char, 0)
+                self._output[following] = self._output[following] + self._output[self._fail[following]]
+                queue.append(following)
+        self._built = True
+        return self
+
+    def find(self, text: str) -> list:
+        """Values of every phrase found in the text, in order of where they end"""
+        goto, fail, output = self._goto, self._fail, self._output
+        found = []
+        node = 0
+        for char in normalize(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if output[node]:
+                found.extend(output[node])
+        return found
+
+
+class RubricScore:
+    """Which of a question's rubric terms an answer mentions, and the grade that suggests"""
+
+    __slots__ = ("matched", "missing", "total")
+
+    def __init__(self, matched: list, missing: list, total: int):
+        self.matched = matched  # Phrases found, one per rubric term
+        self.missing = missing  # First phrase of each rubric term not found
+        self.total = total
+
+    @property
+    def hits(self) -> int:
+        return len(self.matched)
+
+    @property
+    def complete(self) -> bool:
+        return self.hits == self.total
+
+    @property
+    def status(self) -> str:
+        return "correct" if self.hits else "wrong"
+
+    @property
+    def points(self) -> int:
+        """Wrong answers get 1 point; correct ones 2-5 by the share of terms mentioned"""
+        if not self.hits:
+            return 1
+        return 2 + 3 * self.hits // self.total
+
+
+class RubricIndex:
+    """
+    Every question's rubric in one KeywordMatcher, built once per question bank.
+
+    A rubric is a list of terms the answer is expected to mention. Each term is a phrase,
+    or a list of interchangeable phrases of which any one counts.
+    """
+
+    def __init__(self):
+        self.terms = {}  # {question_id: [[phrase, ...], ...]}
+        self._matcher = KeywordMatcher()
+
+    def __len__(self):
+        return len(self.terms)
+
+    def __contains__(self, question_id) -> bool:
+        return question_id in self.terms
+
+    def add(self, question_id: int, rubric: list):
+        terms = []
+        for term in rubric:
+            phrases = [term] if isinstance(term, str) else term if isinstance(term, list) else None
+            if not phrases or not all(isinstance(phrase, str) and normalize(phrase).strip() for phrase in phrases):
+                raise ValueError(f"Invalid rubric term for question {question_id}: {term!r}")
+            for phrase in phrases:
+                self._matcher.add(phrase, (question_id, len(terms), phrase))
+            terms.append(list(phrases))
+        if terms:
+            self.terms[question_id] = terms
+
+    def build(self):
+        self._matcher.build()
+        return self
+
+    def score(self, question_id: int, text: str):
+        """RubricScore of an answer, or None when the question has no rubric"""
+        terms = self.terms.get(question_id)
+        if terms is None:
+            return None
+        found = {}  # {term index: first phrase found}
+        for match_question, term, phrase in self._matcher.find(text):
+            if match_question == question_id:
+                found.setdefault(term, phrase)
+        return RubricScore(
+            [found[term] for term in sorted(found)],
+            [phrases[0] for term, phrases in enumerate(terms) if term not in found],
+            len(terms)
+        )
@@ -0,0 +1,109 @@
+import asyncio
+import heapq
+import itertools
+import time
+import globals
+import metrics
+
+RETRY_DELAY = 5  # Seconds before retrying a failed spawn; doubles with each failure in a row
+RETRY_MAX_DELAY = 600
+
+
+class EventConfig:
+    """Question event state for one category (and the guild it belongs to)"""
+
+    __slots__ = ("category_id", "total", "sent", "deck", "next_fire", "failures")
+
+    def __init__(self, category_id: int, total: int, deck=None):
+        self.category_id = category_id
+        self.total = total
+        self.sent = deck.cursor if deck else 0
+        self.deck = deck  # QuestionDeck this event draws from
+        self.next_fire = None
+        self.failures = 0  # Failed spawns in a row
+
+
+class QuestionScheduler:
+    """
+    Runs any number of question events from a single task.
+
+    Next fire times live in a heap, so the task sleeps until the earliest due event
+    instead of every event owning its own loop. `spawn` is awaited with the config
+    and returns the delay in seconds until the next spawn, or None to end the event. A spawn
+    that raises (e.g. a failed send) is retried with exponential backoff, so a transient
+    REST or network error doesn't end the event.
+    """
+
+    def __init__(self, spawn):
+        self.spawn = spawn
+        self.configs = {}  # {category_id: EventConfig}
+        self._heap = []  # [(when, seq, category_id)]
+        self._seq = itertools.count()
+        self._wake = asyncio.Event()
+        self._task = None
+        self._running = set()
+
+    def add(self, config: EventConfig, delay: float = 0):
+        self.configs[config.category_id] = config
+        self.schedule(config, delay)
+
+    def remove(self, category_id: int):
+        # Heap entries of removed configs are skipped when popped
+        self.configs.pop(category_id, None)
+
+    def schedule(self, config: EventConfig, delay: float):
+        config.next_fire = time.monotonic() + delay
+        heapq.heappush(self._heap, (config.next_fire, next(self._seq), config.category_id))
+        self._wake.set()
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        for task in self._running:
+            task.cancel()
+
+    async def _run(self):
+        while True:
+            self._wake.clear()
+            if not self._heap:
+                await self._wake.wait()
+                continue
+
+            when, _, category_id = self._heap[0]
+            delay = when - time.monotonic()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            heapq.heappop(self._heap)
+            config = self.configs.get(category_id)
+            if config is None or config.next_fire != when:
+                continue  # Removed or rescheduled since this entry was pushed
+
+            task = asyncio.create_task(self._fire(config))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _fire(self, config: EventConfig):
+        try:
+            async with metrics.track("scheduler", "spawn_question"):
+                delay = await self.spawn(config)
+            config.failures = 0
+        except Exception as e:
+            delay = min(RETRY_MAX_DELAY, RETRY_DELAY * 2 ** config.failures)
+            config.failures += 1
+            globals.log_message(error=e)
+            globals.log_message(message=f"Spawning a question in category {config.category_id} failed, retrying in {delay}s", action="warn")
+
+        if delay is None:
+            self.remove(config.category_id)
+        elif self.configs.get(config.category_id) is config:
+            self.schedule(config, delay)
@@ -0,0 +1,206 @@
+import asyncio
+import re
+import numpy as np
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class _QuestionSignatures:
+    """MinHash signatures of one question's answers, one row per answer"""
+
+    __slots__ = ("answer_ids", "signatures", "size")
+
+    def __init__(self, num_perm: int):
+        self.answer_ids = []
+        self.signatures = np.empty((16, num_perm), dtype=np.uint32)
+        self.size = 0
+
+    def append(self, answer_id: int, signature: np.ndarray) -> int:
+        if self.size == len(self.signatures):
+            grown = np.empty((self.size * 2, self.signatures.shape[1]), dtype=np.uint32)
+            grown[:self.size] = self.signatures
+            self.signatures = grown
+        self.signatures[self.size] = signature
+        self.answer_ids.append(answer_id)
+        self.size += 1
+        return self.size - 1
+
+    @property
+    def matrix(self) -> np.ndarray:
+        return self.signatures[:self.size]
+
+
+class SimilarityIndex:
+    """
+    Near-duplicate detection between answers to the same question.
+
+    Each answer is reduced to a MinHash signature over character shingles, and the share
+    of equal signature positions estimates the Jaccard similarity of two answers. New
+    answers are only queued on submit; run_signer() signs the queue in batches, one array
+    operation each, on a worker thread. Clusters are found with LSH banding: answers that
+    agree on a whole band become candidate pairs, candidates are verified against the
+    threshold, and connected components are taken over the rest. None of it loops over
+    answer pairs in Python, so questions with thousands of answers stay cheap. Reads only
+    see answers that are signed already, so they never wait on the queue. The index is
+    changed on the event loop, apart from load(); clusters() may run on a worker thread
+    since signature rows are never rewritten once appended.
+    """
+
+    BATCH_SIZE = 128  # Texts signed per array operation; bounds the (perms x shingles) intermediate
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, shingle: int = 5, threshold: float = 0.7, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.bands = bands
+        self.shingle = shingle
+        self.threshold = threshold
+        # Multiply-shift hashing: odd 64-bit multipliers, keep the high 32 bits
+        self._a = rng.integers(0, 1 << 63, num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._b = rng.integers(0, 1 << 63, num_perm, dtype=np.uint64)
+        self._band_mix = rng.integers(1, 1 << 61, num_perm // bands, dtype=np.uint64)
+        self.questions = {}  # {question_id: _QuestionSignatures}
+        self.rows = {}  # {answer_id: (question_id, row)}
+        self._pending = []  # [(question_id, answer_id, text)] not signed yet
+        self._queued = set()
+        self._wake = asyncio.Event()
+        self.loaded = False
+
+    def __len__(self):
+        return len(self.rows) + len(self._pending)
+
+    @property
+    def pending(self) -> int:
+        return len(self._queued)
+
+    def _shingles(self, text: str) -> np.ndarray:
+        data = np.frombuffer(_WHITESPACE.sub(" ", text.lower()).strip().encode("utf-8"), dtype=np.uint8).astype(np.uint64)
+        if len(data) == 0:
+            return np.zeros(1, dtype=np.uint64)
+        width = min(self.shingle, len(data))
+        count = len(data) - width + 1
+        shingles = np.zeros(count, dtype=np.uint64)
+        for offset in range(width):
+            shingles = (shingles << np.uint64(8)) | data[offset:offset + count]
+        return shingles
+
+    def signatures(self, texts: list) -> np.ndarray:
+        """MinHash signatures of several texts at once, shape (len(texts), num_perm)"""
+        shingles = [self._shingles(text) for text in texts]
+        starts = np.cumsum([0] + [len(entry) for entry in shingles[:-1]])
+        hashed = (np.multiply.outer(self._a, np.concatenate(shingles)) + self._b[:, None]) >> np.uint64(32)
+        return np.minimum.reduceat(hashed, starts, axis=1).T.astype(np.uint32)
+
+    def add(self, question_id: int, answer_id: int, text: str):
+        """Queue an answer; run_signer() signs it with the next batch"""
+        if answer_id in self.rows or answer_id in self._queued:
+            return
+        self._queued.add(answer_id)
+        self._pending.append((question_id, answer_id, text))
+        self._wake.set()
+
+    def _insert(self, entries, signatures):
+        for (question_id, answer_id, _), signature in zip(entries, signatures):
+            if answer_id in self.rows:
+                continue
+            entry = self.questions.get(question_id)
+            if entry is None:
+                entry = self.questions[question_id] = _QuestionSignatures(self.num_perm)
+            self.rows[answer_id] = (question_id, entry.append(answer_id, signature))
+
+    async def run_signer(self):
+        """Sign queued answers as they arrive, a batch at a time on a worker thread; runs until cancelled"""
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+            while self._pending:
+                batch = self._pending[:self.BATCH_SIZE]
+                del self._pending[:self.BATCH_SIZE]
+                signatures = await asyncio.to_thread(self.signatures, [text for _, _, text in batch])
+                self._insert(batch, signatures)
+                self._queued.difference_update(answer_id for _, answer_id, _ in batch)
+
+    def load(self, answers):
+        """Replace the index with (question_id, answer_id, text) entries; safe to run on a worker thread"""
+        index = SimilarityIndex.__new__(SimilarityIndex)
+        index.__dict__.update(self.__dict__)
+        index.questions, index.rows = {}, {}
+        answers = list(answers)
+        for start in range(0, len(answers), self.BATCH_SIZE):
+            batch = answers[start:start + self.BATCH_SIZE]
+            index._insert(batch, self.signatures([text for _, _, text in batch]))
+        # Swapped in at the end so readers never see a half built index
+        self.questions, self.rows = index.questions, index.rows
+        self.loaded = True
+
+    def similar_to(self, answer_id: int, limit: int = 5, threshold: float = None) -> list:
+        """[(answer_id, similarity)] of other signed answers to the same question, most similar first"""
+        location = self.rows.get(answer_id)
+        if location is None:
+            return []
+        question_id, row = location
+        entry = self.questions[question_id]
+        matrix = entry.matrix
+        scores = (matrix == matrix[row]).mean(axis=1)
+        scores[row] = 0
+        matches = np.flatnonzero(scores >= (self.threshold if threshold is None else threshold))
+        matches = matches[np.argsort(-scores[matches], kind="stable")][:limit]
+        return [(entry.answer_ids[i], float(scores[i])) for i in matches]
+
+    def _candidate_pairs(self, matrix: np.ndarray):
+        """Pairs that agree on at least one band, each joined to its bucket's first member"""
+        n = len(matrix)
+        keys = (matrix.reshape(n, self.bands, -1).astype(np.uint64) * self._band_mix).sum(axis=2)
+        left, right = [], []
+        for band in range(self.bands):
+            order = np.argsort(keys[:, band], kind="stable")
+            ordered = keys[order, band]
+            starts = np.ones(n, dtype=bool)
+            starts[1:] = ordered[1:] != ordered[:-1]
+            leaders = order[np.maximum.accumulate(np.where(starts, np.arange(n), 0))]
+            linked = leaders != order
+            left.append(leaders[linked])
+            right.append(order[linked])
+        if not left:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        pairs = np.unique(np.stack([np.concatenate(left), np.concatenate(right)], axis=1), axis=0)
+        return pairs[:, 0], pairs[:, 1]
+
+    def clusters(self, question_id: int, threshold: float = None) -> list:
+        """
+        [(answer_ids, mean similarity)] of groups of near-identical signed answers, largest first
+        """
+        entry = self.questions.get(question_id)
+        if entry is None or entry.size < 2:
+            return []
+        threshold = self.threshold if threshold is None else threshold
+        matrix = entry.matrix
+        left, right = self._candidate_pairs(matrix)
+        scores = (matrix[left] == matrix[right]).mean(axis=1)
+        keep = scores >= threshold
+        left, right, scores = left[keep], right[keep], scores[keep]
+        if not len(left):
+            return []
+
+        # Connected components by label propagation with pointer jumping
+        labels = np.arange(entry.size)
+        while True:
+            low = np.minimum(labels[left], labels[right])
+            updated = labels.copy()
+            np.minimum.at(updated, left, low)
+            np.minimum.at(updated, right, low)
+            updated = updated[updated]
+            if np.array_equal(updated, labels):
+                break
+            labels = updated
+
+        sizes = np.bincount(labels, minlength=entry.size)
+        edge_totals = np.bincount(labels[left], weights=scores, minlength=entry.size)
+        edge_counts = np.bincount(labels[left], minlength=entry.size)
+        result = []
+        for root in np.flatnonzero(sizes >= 2):
+            members = np.flatnonzero(labels == root)
+            result.append(([entry.answer_ids[i] for i in members], float(edge_totals[root] / edge_counts[root])))
+        result.sort(key=lambda cluster: (-len(cluster[0]), -cluster[1]))
+        return result
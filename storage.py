@@ -0,0 +1,473 @@
+import asyncio
+import json
+import os
+import sqlite3
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+import globals
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    user_id INTEGER PRIMARY KEY,
+    score INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS answers (
+    answer_id INTEGER PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    question_id INTEGER NOT NULL,
+    question TEXT NOT NULL,
+    answer TEXT NOT NULL,
+    status TEXT
+);
+CREATE TABLE IF NOT EXISTS decks (
+    deck_id TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS deck_cursors (
+    deck_id TEXT PRIMARY KEY,
+    cursor INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS posts (
+    message_id INTEGER PRIMARY KEY,
+    data TEXT NOT NULL
+);
+"""
+
+SHARED_SCHEMA = """
+CREATE TABLE IF NOT EXISTS changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    origin TEXT NOT NULL,
+    ts REAL NOT NULL,
+    kind TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS changes_ts ON changes (ts);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+class MemoryStorage:
+    """Keeps the event state in process memory only. Useful for tests and dry runs."""
+
+    def __init__(self):
+        self.scores = {}
+        self.answers = {}  # {answer_id: [user_id, question_id, question, answer, status]}
+        self.decks = {}
+        self.cursors = {}
+        self.posts = {}
+
+    async def open(self):
+        pass
+
+    async def close(self):
+        pass
+
+    async def flush(self):
+        pass
+
+    async def load(self):
+        """Return (scores, answer rows); rows are (answer_id, user_id, question_id, question, answer, status)"""
+        return dict(self.scores), [(answer_id, *row) for answer_id, row in sorted(self.answers.items())]
+
+    def listen(self, callback):
+        pass  # Nothing else writes to process memory
+
+    async def next_answer_id(self, local_max: int) -> int:
+        return local_max + 1
+
+    def save_answer(self, answer, question: str):
+        self.answers[answer.answer_id] = [answer.user_id, answer.question_id, question, answer.text, None]
+
+    def add_score(self, user_id: int, delta: int):
+        self.scores[user_id] = self.scores.get(user_id, 0) + delta
+
+    def save_validation(self, answer_id: int, status):
+        self.answers[answer_id][4] = status
+
+    async def load_decks(self):
+        """Return {deck_id: deck state dict}"""
+        return {deck_id: {**json.loads(data), "cursor": self.cursors[deck_id]} for deck_id, data in self.decks.items()}
+
+    def save_deck(self, deck_id: str, data: dict):
+        """Store a deck's whole state; only needed when its order changes"""
+        self.decks[deck_id] = json.dumps(data)
+        self.cursors[deck_id] = data["cursor"]
+
+    def save_deck_cursor(self, deck_id: str, cursor: int):
+        self.cursors[deck_id] = cursor
+
+    async def load_posts(self):
+        """Return {message_id: post state dict} for question posts still open"""
+        return {message_id: json.loads(data) for message_id, data in self.posts.items()}
+
+    def save_post(self, message_id: int, data):
+        """Store an open question post; None deletes it"""
+        if data is None:
+            self.posts.pop(message_id, None)
+        else:
+            self.posts[message_id] = json.dumps(data)
+
+
+class SQLiteStorage:
+    """
+    SQLite backed storage running in WAL mode.
+
+    Writes are queued in memory and committed by a background flusher in a single
+    transaction, so a burst of submissions costs one fsync instead of one each.
+    All database access happens on a dedicated worker thread, never on the event loop.
+    """
+
+    def __init__(self, path: str, flush_interval: float = 1.0, max_batch: int = 500):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+
+        self._conn = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="storage")
+        self._task = None
+        self._wake = None
+
+        # Pending writes; score deltas are summed and statuses coalesced to the latest value
+        self._answers = []
+        self._scores = {}
+        self._validation = {}
+        self._decks = {}
+        self._cursors = {}
+        self._posts = {}
+
+    def _pending(self) -> int:
+        return (len(self._answers) + len(self._scores) + len(self._validation) + len(self._decks)
+                + len(self._cursors) + len(self._posts))
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        conn.executescript(SCHEMA)
+        return conn
+
+    async def open(self):
+        self._conn = await self._run(self._connect)
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._flusher())
+
+    async def close(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+        if self._conn:
+            await self._run(self._conn.close)
+            self._conn = None
+        self._executor.shutdown(wait=False)
+
+    def _read_all(self):
+        scores = dict(self._conn.execute("SELECT user_id, score FROM scores"))
+        rows = self._conn.execute(
+            "SELECT answer_id, user_id, question_id, question, answer, status FROM answers ORDER BY answer_id"
+        ).fetchall()
+        return scores, rows
+
+    async def load(self):
+        """Return (scores, answer rows); rows are (answer_id, user_id, question_id, question, answer, status)"""
+        await self.flush()
+        return await self._run(self._read_all)
+
+    def listen(self, callback):
+        pass  # A single process is the only writer
+
+    async def next_answer_id(self, local_max: int) -> int:
+        """ID for the next answer; this process holds every answer, so it's allocated locally"""
+        return local_max + 1
+
+    def _read_decks(self):
+        # The cursor saved on each draw is newer than the one inside the order's data
+        rows = self._conn.execute(
+            "SELECT decks.deck_id, data, cursor FROM decks LEFT JOIN deck_cursors USING (deck_id)"
+        )
+        decks = {}
+        for deck_id, data, cursor in rows:
+            decks[deck_id] = json.loads(data)
+            if cursor is not None:
+                decks[deck_id]["cursor"] = cursor
+        return decks
+
+    async def load_decks(self):
+        """Return {deck_id: deck state dict}"""
+        await self.flush()
+        return await self._run(self._read_decks)
+
+    def _read_posts(self):
+        return {message_id: json.loads(data) for message_id, data in self._conn.execute("SELECT message_id, data FROM posts")}
+
+    async def load_posts(self):
+        """Return {message_id: post state dict} for question posts still open"""
+        await self.flush()
+        return await self._run(self._read_posts)
+
+    def _kick(self):
+        if self._wake is not None and self._pending() >= self.max_batch:
+            self._wake.set()
+
+    def save_answer(self, answer, question: str):
+        self._answers.append((answer.answer_id, answer.user_id, answer.question_id, question, answer.text))
+        self._kick()
+
+    def add_score(self, user_id: int, delta: int):
+        self._scores[user_id] = self._scores.get(user_id, 0) + delta
+        self._kick()
+
+    def save_validation(self, answer_id: int, status):
+        self._validation[answer_id] = status
+        self._kick()
+
+    def save_deck(self, deck_id: str, data: dict):
+        """Store a deck's whole state; only needed when its order changes"""
+        self._decks[deck_id] = json.dumps(data)
+        self._cursors[deck_id] = data["cursor"]
+        self._kick()
+
+    def save_deck_cursor(self, deck_id: str, cursor: int):
+        self._cursors[deck_id] = cursor
+        self._kick()
+
+    def save_post(self, message_id: int, data):
+        """Store an open question post; None deletes it"""
+        self._posts[message_id] = None if data is None else json.dumps(data)
+        self._kick()
+
+    def _write(self, answers, scores, validation, decks, cursors, posts):
+        cur = self._conn.cursor()
+        cur.execute("BEGIN")
+        try:
+            # Answers go first so status updates in the same batch find their rows
+            cur.executemany(
+                "INSERT OR REPLACE INTO answers (answer_id, user_id, question_id, question, answer, status) "
+                "VALUES (?, ?, ?, ?, ?, NULL)",
+                answers
+            )
+            cur.executemany(
+                "UPDATE answers SET status = ? WHERE answer_id = ?",
+                [(status, answer_id) for answer_id, status in validation.items()]
+            )
+            # Deltas rather than totals, so concurrent writers never overwrite each other
+            cur.executemany(
+                "INSERT INTO scores (user_id, score) VALUES (?, ?) "
+                "ON CONFLICT(user_id) DO UPDATE SET score = score + excluded.score",
+                list(scores.items())
+            )
+            cur.executemany(
+                "INSERT INTO decks (deck_id, data) VALUES (?, ?) "
+                "ON CONFLICT(deck_id) DO UPDATE SET data = excluded.data",
+                list(decks.items())
+            )
+            cur.executemany(
+                "INSERT INTO deck_cursors (deck_id, cursor) VALUES (?, ?) "
+                "ON CONFLICT(deck_id) DO UPDATE SET cursor = excluded.cursor",
+                list(cursors.items())
+            )
+            cur.executemany(
+                "INSERT INTO posts (message_id, data) VALUES (?, ?) "
+                "ON CONFLICT(message_id) DO UPDATE SET data = excluded.data",
+                [(message_id, data) for message_id, data in posts.items() if data is not None]
+            )
+            cur.executemany(
+                "DELETE FROM posts WHERE message_id = ?",
+                [(message_id,) for message_id, data in posts.items() if data is None]
+            )
+            self._log_changes(cur, answers, scores, validation)
+            cur.execute("COMMIT")
+        except Exception:
+            cur.execute("ROLLBACK")
+            raise
+
+    def _log_changes(self, cur, answers, scores, validation):
+        pass
+
+    async def flush(self):
+        """Commit every pending write in one transaction"""
+        if not self._pending() or self._conn is None:
+            return
+
+        answers, self._answers = self._answers, []
+        scores, self._scores = self._scores, {}
+        validation, self._validation = self._validation, {}
+        decks, self._decks = self._decks, {}
+        cursors, self._cursors = self._cursors, {}
+        posts, self._posts = self._posts, {}
+
+        try:
+            await self._run(self._write, answers, scores, validation, decks, cursors, posts)
+        except Exception as e:
+            # Put the batch back so the next flush retries it
+            self._answers[:0] = answers
+            for user_id, delta in scores.items():
+                self._scores[user_id] = self._scores.get(user_id, 0) + delta
+            self._validation = {**validation, **self._validation}
+            self._decks = {**decks, **self._decks}
+            self._cursors = {**cursors, **self._cursors}
+            self._posts = {**posts, **self._posts}
+            globals.log_message(error=e)
+
+    async def _flusher(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
+
+
+class SharedSQLiteStorage(SQLiteStorage):
+    """
+    SQLite storage shared by several bot processes (one per group of shards).
+
+    Every committed batch is also appended to a change log. Each process polls the log
+    for other processes' changes and hands them to the listener, so leaderboards and
+    reviews see the same data whichever shard serves the interaction. Answer IDs
+    come from a counter in the database, so two processes never hand out the same one.
+    """
+
+    def __init__(self, path: str, poll_interval: float = 1.0, retention: float = 3600, **kwargs):
+        super().__init__(path, **kwargs)
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self.origin = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._listener = None
+        self._last_seq = 0
+        self._poller = None
+
+    def _connect(self):
+        conn = super()._connect()
+        conn.executescript(SHARED_SCHEMA)
+        return conn
+
+    def _latest_seq(self):
+        return self._conn.execute("SELECT COALESCE(MAX(seq), 0) FROM changes").fetchone()[0]
+
+    def _read_all(self):
+        # The snapshot and the log position come from one read transaction, so every change
+        # is either in the snapshot or after _last_seq, never both
+        self._conn.execute("BEGIN")
+        try:
+            scores, rows = super()._read_all()
+            seq = self._latest_seq()
+        finally:
+            self._conn.execute("COMMIT")
+        return scores, rows, seq
+
+    async def load(self):
+        scores, rows, self._last_seq = await super().load()
+        # Polling starts from the snapshot; changes before it are covered by the rows
+        if self._poller is None:
+            self._poller = asyncio.create_task(self._poll())
+        return scores, rows
+
+    async def close(self):
+        if self._poller:
+            self._poller.cancel()
+            try:
+                await self._poller
+            except asyncio.CancelledError:
+                pass
+            self._poller = None
+        await super().close()
+
+    def listen(self, callback):
+        """callback(kind, data) is called on the event loop for changes made by other processes"""
+        self._listener = callback
+
+    def _allocate_id(self) -> int:
+        cur = self._conn.cursor()
+        cur.execute("BEGIN IMMEDIATE")
+        try:
+            row = cur.execute(
+                "SELECT MAX(COALESCE((SELECT value FROM counters WHERE name = 'answer_id'), 0), "
+                "COALESCE((SELECT MAX(answer_id) FROM answers), 0))"
+            ).fetchone()
+            answer_id = row[0] + 1
+            cur.execute(
+                "INSERT INTO counters (name, value) VALUES ('answer_id', ?) "
+                "ON CONFLICT(name) DO UPDATE SET value = excluded.value",
+                (answer_id,)
+            )
+            cur.execute("COMMIT")
+        except Exception:
+            cur.execute("ROLLBACK")
+            raise
+        return answer_id
+
+    async def next_answer_id(self, local_max: int) -> int:
+        return await self._run(self._allocate_id)
+
+    def _log_changes(self, cur, answers, scores, validation):
+        now = time.time()
+        rows = [
+            ("answer", json.dumps({
+                "answer_id": answer_id, "user_id": user_id,
+                "question_id": question_id, "question": question, "answer": answer
+            }))
+            for answer_id, user_id, question_id, question, answer in answers
+        ]
+        rows += [
+            ("validation", json.dumps({"answer_id": answer_id, "status": status}))
+            for answer_id, status in validation.items()
+        ]
+        rows += [
+            ("score", json.dumps({"user_id": user_id, "delta": delta}))
+            for user_id, delta in scores.items()
+        ]
+        cur.executemany(
+            "INSERT INTO changes (origin, ts, kind, data) VALUES (?, ?, ?, ?)",
+            [(self.origin, now, kind, data) for kind, data in rows]
+        )
+
+    def _read_changes(self, after: int):
+        rows = self._conn.execute(
+            "SELECT seq, origin, kind, data FROM changes WHERE seq > ? ORDER BY seq",
+            (after,)
+        ).fetchall()
+        self._conn.execute("DELETE FROM changes WHERE ts < ?", (time.time() - self.retention,))
+        return rows
+
+    async def _poll(self):
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                rows = await self._run(self._read_changes, self._last_seq)
+            except Exception as e:
+                globals.log_message(error=e)
+                continue
+            for seq, origin, kind, data in rows:
+                self._last_seq = seq
+                if origin != self.origin and self._listener:
+                    try:
+                        self._listener(kind, json.loads(data))
+                    except Exception as e:
+                        globals.log_message(error=e)
+
+
+def create_storage(backend: str = "sqlite", path: str = "event.db", **kwargs):
+    """Build a storage backend by name ('sqlite', 'shared-sqlite' or 'memory')"""
+    backend = backend.lower()
+    if backend == "sqlite":
+        return SQLiteStorage(path, **kwargs)
+    if backend == "shared-sqlite":
+        return SharedSQLiteStorage(path, **kwargs)
+    if backend == "memory":
+        return MemoryStorage()
+    raise ValueError(f"Unknown storage backend: {backend}")